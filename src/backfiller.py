@@ -1,4 +1,6 @@
 import hashlib
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from urllib.parse import urljoin
 
@@ -14,6 +16,13 @@ logger = setup_logger(__name__)
 # Maximum pages to fetch per creator to prevent infinite loops
 _MAX_PAGES_PER_CREATOR = 50
 
+# Creators backfilled concurrently. Requests are still globally rate limited
+# by http_client, so this only needs to cover slow responses, not the pool size.
+_BACKFILL_WORKERS = 4
+
+# Last path segment of a URL, ignoring a trailing slash and any query/fragment
+_GAME_SLUG_RE = re.compile(r"(?:^|/)([^/?#]+)/?(?:[?#]|$)")
+
 
 def backfill_creator(creator: Creator) -> int:
     """
@@ -28,67 +37,89 @@ def backfill_creator(creator: Creator) -> int:
         Number of games inserted
 
     Raises:
-        Exception: If profile fetching fails
+        Exception: If profile fetching fails. Games from pages parsed
+            before the failure are still inserted.
     """
     inserted_count = 0
     pages_parsed = 0
     current_url = creator.profile_url
     visited_urls = set()
-
-    for _ in range(_MAX_PAGES_PER_CREATOR):
-        # Check for pagination loop
-        if current_url in visited_urls:
-            break
-
-        visited_urls.add(current_url)
-
-        # Fetch the current profile page
-        html = fetch(current_url)
-
-        # Parse games and get next page URL
-        games, next_url = profile.parse_profile(html)
-
-        # Increment pages parsed (even if no games)
-        pages_parsed += 1
-
-        # Insert games into database
-        for game_data in games:
-            # Resolve relative game URL to absolute
-            game_url = urljoin(current_url, game_data["url"])
-
-            # Extract itch_id from URL
-            # Example: https://testdev.itch.io/cool-game -> cool-game
-            itch_id = _extract_game_id(game_url)
-
-            game = Game(
-                id=None,
-                itch_id=itch_id,
-                title=game_data["title"],
-                creator_name=creator.name,
-                url=game_url,
-                publish_date=game_data["publish_date"].date() if game_data["publish_date"] else None,
-                rating=None,
-                rating_count=0,
-                comment_count=0,
-                description=None,
-                tags=None,
-                scraped_at=None
-            )
-
-            game_id = db.insert_game(game)
-            if game_id:
-                inserted_count += 1
-
-        # Stop if no more pages
-        if not next_url:
-            break
-
-        # Resolve relative next_url to absolute
-        current_url = urljoin(current_url, next_url)
-
-    # Mark creator as backfilled ONLY if at least one page was parsed
-    if pages_parsed > 0:
-        db.mark_creator_backfilled(creator.id)
+    creator_games: list[Game] = []
+    seen_game_ids: set[str] = set()
+
+    try:
+        for _ in range(_MAX_PAGES_PER_CREATOR):
+            # Check for pagination loop
+            if current_url in visited_urls:
+                break
+
+            visited_urls.add(current_url)
+
+            # Fetch the current profile page
+            html = fetch(current_url)
+
+            # Parse games and get next page URL
+            games, next_url = profile.parse_profile(html)
+
+            # Increment pages parsed (even if no games)
+            pages_parsed += 1
+
+            # Collect games from every page so they can be inserted in one batch
+            for game_data in games:
+                # Resolve relative game URL to absolute
+                game_url = urljoin(current_url, game_data["url"])
+
+                # Extract itch_id from URL
+                # Example: https://testdev.itch.io/cool-game -> cool-game
+                itch_id = _extract_game_id(game_url)
+
+                # Skip games already listed on an earlier page (or twice on this one)
+                if itch_id in seen_game_ids:
+                    continue
+                seen_game_ids.add(itch_id)
+
+                creator_games.append(Game(
+                    id=None,
+                    itch_id=itch_id,
+                    title=game_data["title"],
+                    creator_name=creator.name,
+                    url=game_url,
+                    publish_date=game_data["publish_date"].date() if game_data["publish_date"] else None,
+                    rating=None,
+                    rating_count=0,
+                    comment_count=0,
+                    description=None,
+                    tags=None,
+                    scraped_at=None
+                ))
+
+            # Stop if no more pages
+            if not next_url:
+                break
+
+            # Resolve relative next_url to absolute
+            current_url = urljoin(current_url, next_url)
+    except Exception:
+        # Keep the games from pages already parsed. The creator stays
+        # unbackfilled, so the whole profile is retried on the next run.
+        if creator_games:
+            try:
+                with db.transaction():
+                    db.insert_games_bulk(creator_games, creator.id)
+            except Exception as insert_error:
+                # Log and drop this one so the fetch/parse error is what's re-raised
+                log_error_with_context(logger, "Backfill partial insert", creator.name, insert_error)
+        raise
+
+    # Publish the games and the backfilled flag together in one commit.
+    # Mark creator as backfilled ONLY if at least one page was parsed.
+    with db.transaction():
+        if creator_games:
+            inserted_count = len(db.insert_games_bulk(
+                creator_games, creator.id, mark_backfilled=pages_parsed > 0
+            ))
+        elif pages_parsed > 0:
+            db.mark_creator_backfilled(creator.id)
 
     return inserted_count
 
@@ -108,15 +139,29 @@ def backfill_all() -> dict[str, int]:
 
     creators = db.get_unbackfilled_creators()
 
-    for creator in creators:
+    def collect(future: Future, creator: Creator) -> None:
         try:
-            games_count = backfill_creator(creator)
+            games_count = future.result()
             stats["creators_processed"] += 1
             stats["games_inserted"] += games_count
         except Exception as e:
             stats["errors"] += 1
             log_error_with_context(logger, "Backfill", creator.name, e)
 
+    # Keep a bounded number of creators in flight so the streamed
+    # creator list is never fully materialized
+    with ThreadPoolExecutor(max_workers=_BACKFILL_WORKERS) as executor:
+        pending: dict[Future, Creator] = {}
+        for creator in creators:
+            pending[executor.submit(backfill_creator, creator)] = creator
+            if len(pending) >= _BACKFILL_WORKERS * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future, pending.pop(future))
+
+        for future in list(pending):
+            collect(future, pending.pop(future))
+
     return stats
 
 
@@ -135,18 +180,10 @@ def _extract_game_id(url: str) -> str:
     Returns:
         Game slug/ID
     """
-    # Remove query parameters
-    url = url.split("?")[0]
-
-    # Remove trailing slash
-    url = url.rstrip("/")
-
-    # Get the path part
-    parts = url.split("/")
-
-    # Last part is the game slug
-    if len(parts) > 0 and parts[-1]:
-        return parts[-1]
+    match = _GAME_SLUG_RE.search(url)
+    if match:
+        return match.group(1)
 
     # Generate stable hash for unparseable URLs to avoid uniqueness collisions
+    url = url.split("?")[0].rstrip("/")
     return f"unknown-{hashlib.sha256(url.encode()).hexdigest()[:12]}"
@@ -1,16 +1,26 @@
 """Scrape itch.io browse pages for game discovery."""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import TypedDict
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from .http_client import fetch
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Browse pages scraped concurrently. Requests are still globally rate limited
+# by http_client, so this only overlaps slow responses.
+_BROWSE_WORKERS = 4
+
+# Subdomain of a creator.itch.io URL, with or without a scheme
+_CREATOR_RE = re.compile(r"(?:https?://)?([^./:]+)\.itch\.io(?:[/:?#]|$)")
+_NON_CREATOR_SUBDOMAINS = frozenset(("www", "itch", "static"))
+
 
 class BrowseGame(TypedDict):
     """Represents a game found on a browse page."""
@@ -19,75 +29,77 @@ class BrowseGame(TypedDict):
     creator: str
 
 
-# Browse page configurations - expanded for maximum discovery
-BROWSE_PAGES = {
+# Browse page configurations as (name, url) pairs - expanded for maximum discovery
+BROWSE_PAGES: tuple[tuple[str, str], ...] = (
     # Main discovery pages (high-value)
-    "top-rated": "https://itch.io/games/top-rated",
-    "popular": "https://itch.io/games",
-    "new-popular": "https://itch.io/games/new-and-popular",
-    "top-sellers": "https://itch.io/games/top-sellers",
-    "newest": "https://itch.io/games/newest",
-    "featured": "https://itch.io/games/featured",
+    ("top-rated", "https://itch.io/games/top-rated"),
+    ("popular", "https://itch.io/games"),
+    ("new-popular", "https://itch.io/games/new-and-popular"),
+    ("top-sellers", "https://itch.io/games/top-sellers"),
+    ("newest", "https://itch.io/games/newest"),
+    ("featured", "https://itch.io/games/featured"),
 
     # All genres
-    "action": "https://itch.io/games/genre-action",
-    "adventure": "https://itch.io/games/genre-adventure",
-    "card-game": "https://itch.io/games/genre-card-game",
-    "educational": "https://itch.io/games/genre-educational",
-    "fighting": "https://itch.io/games/genre-fighting",
-    "interactive-fiction": "https://itch.io/games/genre-interactive-fiction",
-    "platformer": "https://itch.io/games/genre-platformer",
-    "puzzle": "https://itch.io/games/genre-puzzle",
-    "racing": "https://itch.io/games/genre-racing",
-    "rhythm": "https://itch.io/games/genre-rhythm",
-    "roguelike": "https://itch.io/games/genre-roguelike",
-    "rpg": "https://itch.io/games/genre-rpg",
-    "shooter": "https://itch.io/games/genre-shooter",
-    "simulation": "https://itch.io/games/genre-simulation",
-    "sports": "https://itch.io/games/genre-sports",
-    "strategy": "https://itch.io/games/genre-strategy",
-    "survival": "https://itch.io/games/genre-survival",
-    "visual-novel": "https://itch.io/games/genre-visual-novel",
+    ("action", "https://itch.io/games/genre-action"),
+    ("adventure", "https://itch.io/games/genre-adventure"),
+    ("card-game", "https://itch.io/games/genre-card-game"),
+    ("educational", "https://itch.io/games/genre-educational"),
+    ("fighting", "https://itch.io/games/genre-fighting"),
+    ("interactive-fiction", "https://itch.io/games/genre-interactive-fiction"),
+    ("platformer", "https://itch.io/games/genre-platformer"),
+    ("puzzle", "https://itch.io/games/genre-puzzle"),
+    ("racing", "https://itch.io/games/genre-racing"),
+    ("rhythm", "https://itch.io/games/genre-rhythm"),
+    ("roguelike", "https://itch.io/games/genre-roguelike"),
+    ("rpg", "https://itch.io/games/genre-rpg"),
+    ("shooter", "https://itch.io/games/genre-shooter"),
+    ("simulation", "https://itch.io/games/genre-simulation"),
+    ("sports", "https://itch.io/games/genre-sports"),
+    ("strategy", "https://itch.io/games/genre-strategy"),
+    ("survival", "https://itch.io/games/genre-survival"),
+    ("visual-novel", "https://itch.io/games/genre-visual-novel"),
 
     # Popular tags for niche discovery
-    "horror": "https://itch.io/games/tag-horror",
-    "pixel-art": "https://itch.io/games/tag-pixel-art",
-    "retro": "https://itch.io/games/tag-retro",
-    "indie": "https://itch.io/games/tag-indie",
-    "atmospheric": "https://itch.io/games/tag-atmospheric",
-    "story-rich": "https://itch.io/games/tag-story-rich",
-    "metroidvania": "https://itch.io/games/tag-metroidvania",
-    "singleplayer": "https://itch.io/games/tag-singleplayer",
-    "multiplayer": "https://itch.io/games/tag-multiplayer",
-    "co-op": "https://itch.io/games/tag-co-op",
-    "local-multiplayer": "https://itch.io/games/tag-local-multiplayer",
-    "open-world": "https://itch.io/games/tag-open-world",
-    "short": "https://itch.io/games/tag-short",
-    "difficult": "https://itch.io/games/tag-difficult",
-    "relaxing": "https://itch.io/games/tag-relaxing",
-    "cute": "https://itch.io/games/tag-cute",
-    "dark": "https://itch.io/games/tag-dark",
-    "funny": "https://itch.io/games/tag-funny",
-    "2d": "https://itch.io/games/tag-2d",
-    "3d": "https://itch.io/games/tag-3d",
-    "top-down": "https://itch.io/games/tag-top-down",
-    "side-scroller": "https://itch.io/games/tag-side-scroller",
-    "first-person": "https://itch.io/games/tag-first-person",
-    "isometric": "https://itch.io/games/tag-isometric",
+    ("horror", "https://itch.io/games/tag-horror"),
+    ("pixel-art", "https://itch.io/games/tag-pixel-art"),
+    ("retro", "https://itch.io/games/tag-retro"),
+    ("indie", "https://itch.io/games/tag-indie"),
+    ("atmospheric", "https://itch.io/games/tag-atmospheric"),
+    ("story-rich", "https://itch.io/games/tag-story-rich"),
+    ("metroidvania", "https://itch.io/games/tag-metroidvania"),
+    ("singleplayer", "https://itch.io/games/tag-singleplayer"),
+    ("multiplayer", "https://itch.io/games/tag-multiplayer"),
+    ("co-op", "https://itch.io/games/tag-co-op"),
+    ("local-multiplayer", "https://itch.io/games/tag-local-multiplayer"),
+    ("open-world", "https://itch.io/games/tag-open-world"),
+    ("short", "https://itch.io/games/tag-short"),
+    ("difficult", "https://itch.io/games/tag-difficult"),
+    ("relaxing", "https://itch.io/games/tag-relaxing"),
+    ("cute", "https://itch.io/games/tag-cute"),
+    ("dark", "https://itch.io/games/tag-dark"),
+    ("funny", "https://itch.io/games/tag-funny"),
+    ("2d", "https://itch.io/games/tag-2d"),
+    ("3d", "https://itch.io/games/tag-3d"),
+    ("top-down", "https://itch.io/games/tag-top-down"),
+    ("side-scroller", "https://itch.io/games/tag-side-scroller"),
+    ("first-person", "https://itch.io/games/tag-first-person"),
+    ("isometric", "https://itch.io/games/tag-isometric"),
 
     # Platforms
-    "web-games": "https://itch.io/games/platform-web",
-    "windows": "https://itch.io/games/platform-windows",
-    "macos": "https://itch.io/games/platform-osx",
-    "linux": "https://itch.io/games/platform-linux",
-    "android": "https://itch.io/games/platform-android",
+    ("web-games", "https://itch.io/games/platform-web"),
+    ("windows", "https://itch.io/games/platform-windows"),
+    ("macos", "https://itch.io/games/platform-osx"),
+    ("linux", "https://itch.io/games/platform-linux"),
+    ("android", "https://itch.io/games/platform-android"),
 
     # Game jams (prolific indie devs)
-    "jam-games": "https://itch.io/games/in-jam",
+    ("jam-games", "https://itch.io/games/in-jam"),
 
     # Physical games (different creator pool)
-    "physical": "https://itch.io/physical-games",
-}
+    ("physical", "https://itch.io/physical-games"),
+)
+
+BROWSE_PAGES_BY_NAME = dict(BROWSE_PAGES)
 
 
 def scrape_browse_page(url: str, max_pages: int = 3) -> list[BrowseGame]:
@@ -110,15 +122,23 @@ def scrape_browse_page(url: str, max_pages: int = 3) -> list[BrowseGame]:
     while current_url and pages_scraped < max_pages:
         try:
             html = fetch(current_url)
-            soup = BeautifulSoup(html, "lxml")
 
-            # Find all game links
+            # Past the last page of results there are no game cells (and no
+            # next link), so skip parsing it at all
+            if "game_cell" not in html:
+                break
+
+            tree = LexborHTMLParser(html)
+
+            # Each game_cell holds a thumbnail and a title link to the same game
             # Game URLs follow pattern: https://{creator}.itch.io/{game}
-            game_links = soup.find_all("a", class_="game_link")
+            for cell in tree.css("div.game_cell"):
+                link = cell.css_first("a.game_link[href]")
+                if link is None:
+                    continue
 
-            for link in game_links:
-                href = link.get("href", "")
-                if not href or href in seen_urls:
+                href = link.attributes.get("href") or ""
+                if not href:
                     continue
 
                 # Validate it's a game URL (creator.itch.io/game format)
@@ -126,20 +146,20 @@ def scrape_browse_page(url: str, max_pages: int = 3) -> list[BrowseGame]:
                 if not creator:
                     continue
 
-                # Get title from link text or parent
-                title = link.get_text(strip=True)
+                if href in seen_urls:
+                    continue
+                seen_urls.add(href)
+
+                # Get title from link text, then the cell's title link, then the URL slug
+                title = link.text(strip=True)
                 if not title:
-                    # Try to find title in parent game_cell
-                    title_elem = link.find_parent("div", class_="game_cell")
-                    if title_elem:
-                        title_link = title_elem.find("a", class_="title")
-                        if title_link:
-                            title = title_link.get_text(strip=True)
+                    title_link = cell.css_first("a.title")
+                    if title_link:
+                        title = title_link.text(strip=True)
 
                 if not title:
-                    title = href.split("/")[-1]  # Fallback to URL slug
+                    title = href.split("/")[-1]
 
-                seen_urls.add(href)
                 games.append({
                     "title": title,
                     "url": href,
@@ -147,14 +167,16 @@ def scrape_browse_page(url: str, max_pages: int = 3) -> list[BrowseGame]:
                 })
 
             # Find next page link
-            next_link = soup.find("a", class_="next_page")
-            if next_link and next_link.get("href"):
-                current_url = urljoin(url, next_link["href"])
+            next_link = tree.css_first("a.next_page")
+            next_href = next_link.attributes.get("href") if next_link else None
+            if next_href:
+                current_url = urljoin(url, next_href)
             else:
                 current_url = None
 
             pages_scraped += 1
-            logger.debug(f"Scraped page {pages_scraped} of {url}: found {len(games)} games so far")
+            # Lazy %-formatting: this runs per page and DEBUG is usually off
+            logger.debug("Scraped page %d of %s: found %d games so far", pages_scraped, url, len(games))
 
         except Exception as e:
             logger.warning(f"Error scraping {current_url}: {e}")
@@ -176,32 +198,43 @@ def scrape_all_browse_pages(max_pages_per_source: int = 2) -> list[BrowseGame]:
     all_games: list[BrowseGame] = []
     seen_urls: set[str] = set()
 
-    for name, url in BROWSE_PAGES.items():
-        logger.info(f"Scraping {name}...")
-        try:
-            games = scrape_browse_page(url, max_pages=max_pages_per_source)
+    with ThreadPoolExecutor(max_workers=_BROWSE_WORKERS) as executor:
+        futures = {
+            name: executor.submit(scrape_browse_page, url, max_pages=max_pages_per_source)
+            for name, url in BROWSE_PAGES
+        }
 
-            new_count = 0
-            for game in games:
-                if game["url"] not in seen_urls:
-                    seen_urls.add(game["url"])
-                    all_games.append(game)
-                    new_count += 1
+        # Merge in BROWSE_PAGES order so a game listed under several sources
+        # is always credited to the first one, however the threads finish
+        for name, future in futures.items():
+            logger.info(f"Scraping {name}...")
+            try:
+                games = future.result()
 
-            logger.info(f"  Found {len(games)} games, {new_count} new")
+                new_count = 0
+                for game in games:
+                    if game["url"] not in seen_urls:
+                        seen_urls.add(game["url"])
+                        all_games.append(game)
+                        new_count += 1
 
-        except Exception as e:
-            logger.warning(f"Error scraping {name}: {e}")
-            continue
+                logger.info(f"  Found {len(games)} games, {new_count} new")
+
+            except Exception as e:
+                logger.warning(f"Error scraping {name}: {e}")
+                continue
 
     logger.info(f"Total unique games discovered: {len(all_games)}")
     return all_games
 
 
+@lru_cache(maxsize=65536)
 def _extract_creator_from_url(url: str) -> str | None:
     """
     Extract creator username from itch.io URL.
 
+    Results are cached, since popular games show up under many sources.
+
     Example:
         https://testdev.itch.io/cool-game -> testdev
 
@@ -211,18 +244,14 @@ def _extract_creator_from_url(url: str) -> str | None:
     Returns:
         Creator username, or None if URL format is unrecognized
     """
-    # Remove protocol
-    without_protocol = url.split("://", 1)[-1]
-
-    # Get the subdomain (creator name)
-    parts = without_protocol.split(".")
-
-    # Standard subdomain format: creator.itch.io
-    if len(parts) >= 3 and parts[1] == "itch" and parts[2].startswith("io"):
-        if parts[0] and parts[0] not in ["www", "itch", "static"]:
-            return parts[0]
+    match = _CREATOR_RE.match(url)
+    if not match:
+        return None
 
-    return None
+    creator = match.group(1)
+    if creator in _NON_CREATOR_SUBDOMAINS:
+        return None
+    return creator
 
 
 if __name__ == "__main__":
@@ -232,14 +261,14 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         # Scrape specific page
         page_name = sys.argv[1]
-        if page_name in BROWSE_PAGES:
-            games = scrape_browse_page(BROWSE_PAGES[page_name], max_pages=2)
+        if page_name in BROWSE_PAGES_BY_NAME:
+            games = scrape_browse_page(BROWSE_PAGES_BY_NAME[page_name], max_pages=2)
             print(f"\nFound {len(games)} games from {page_name}:")
             for g in games[:10]:
                 print(f"  {g['creator']}: {g['title']}")
         else:
             print(f"Unknown page: {page_name}")
-            print(f"Available: {', '.join(BROWSE_PAGES.keys())}")
+            print(f"Available: {', '.join(BROWSE_PAGES_BY_NAME)}")
     else:
         # Scrape all
         games = scrape_all_browse_pages(max_pages_per_source=1)
@@ -1,17 +1,62 @@
+import atexit
+import io
 import os
+import re
+import threading
+import weakref
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Iterator
 
 import psycopg2
 from dotenv import load_dotenv
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
-from .models import Creator, CreatorScore, Game
+from .models import Creator, CreatorScore, Game, GameRatingUpdate
 
 load_dotenv()
 
 
+# Process-wide connection pool, created lazily on first use.
+# Size can be tuned with POSTGRES_POOL_MIN / POSTGRES_POOL_MAX.
+_pool: ThreadedConnectionPool | None = None
+_pool_lock = threading.Lock()
+_POOL_MIN_CONN = 2
+_POOL_MAX_CONN = 16
+
+# Connection of the enclosing transaction() block, if any
+_active_conn: ContextVar[psycopg2.extensions.connection | None] = ContextVar(
+    "active_conn", default=None
+)
+
+# Names of statements already PREPAREd on each pooled connection.
+# Off by default: transaction-mode poolers such as PgBouncer or the pooled
+# Vercel/Neon POSTGRES_URL don't keep them between transactions. Enable with
+# POSTGRES_PREPARED_STATEMENTS=true on a direct (non-pooled) connection.
+_USE_PREPARED_STATEMENTS = os.getenv("POSTGRES_PREPARED_STATEMENTS", "false").lower() == "true"
+_prepared_statements: "weakref.WeakKeyDictionary[psycopg2.extensions.connection, set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+_prepared_statements_lock = threading.Lock()
+
+# Creator name -> id, filled by insert_creator/get_creator_by_name. Creators
+# are never renamed or deleted, so entries never go stale.
+_creator_id_cache: dict[str, int] = {}
+_creator_id_cache_lock = threading.Lock()
+
+# Rows fetched per query when streaming large result sets
+_STREAM_BATCH_SIZE = 1000
+
+# Batches at least this large are loaded with COPY instead of INSERT
+_COPY_THRESHOLD = 1000
+
+# How long a game claimed by get_unenriched_games is held before another
+# enrich worker may claim it again
+_ENRICH_CLAIM_TTL_MINUTES = 60
+
+
 def get_connection_string() -> str:
     """Get database connection string from environment.
 
@@ -36,10 +81,49 @@ def get_connection_string() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
 
+def _get_pool() -> ThreadedConnectionPool:
+    """Return the shared connection pool, creating it on first call."""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                min_conn = int(os.getenv("POSTGRES_POOL_MIN") or _POOL_MIN_CONN)
+                max_conn = int(os.getenv("POSTGRES_POOL_MAX") or _POOL_MAX_CONN)
+                _pool = ThreadedConnectionPool(
+                    min_conn, max(min_conn, max_conn), get_connection_string()
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Close all pooled connections. Safe to call more than once."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
 @contextmanager
 def get_connection() -> Iterator[psycopg2.extensions.connection]:
-    """Context manager for database connections."""
-    conn = psycopg2.connect(get_connection_string())
+    """Context manager that borrows a connection from the shared pool.
+
+    Commits on success, rolls back on error, and always returns the
+    connection to the pool. Inside a transaction() block, the block's
+    connection is reused and committing is left to the block.
+    """
+    active = _active_conn.get()
+    if active is not None:
+        yield active
+        return
+
+    pool = _get_pool()
+    conn = pool.getconn()
     try:
         yield conn
         conn.commit()
@@ -47,292 +131,737 @@ def get_connection() -> Iterator[psycopg2.extensions.connection]:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        pool.putconn(conn)
 
 
-def create_tables() -> None:
-    """Initialize database schema."""
+@contextmanager
+def transaction() -> Iterator[psycopg2.extensions.connection]:
+    """Run every database call in the block on one connection and commit once.
+
+    Example:
+        with db.transaction():
+            db.insert_games_bulk(games, creator.id)
+            db.mark_creator_backfilled(creator.id)
+    """
     with get_connection() as conn:
-        cursor = conn.cursor()
+        token = _active_conn.set(conn)
+        try:
+            yield conn
+        finally:
+            _active_conn.reset(token)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS creators (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) UNIQUE NOT NULL,
-                profile_url VARCHAR(512) NOT NULL,
-                backfilled BOOLEAN DEFAULT FALSE,
-                first_seen TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS games (
-                id SERIAL PRIMARY KEY,
-                itch_id VARCHAR(255),
-                title VARCHAR(512) NOT NULL,
-                creator_id INTEGER REFERENCES creators(id),
-                url VARCHAR(512) NOT NULL,
-                publish_date DATE,
-                rating DECIMAL(3,2),
-                rating_count INTEGER DEFAULT 0,
-                scraped_at TIMESTAMP,
-                ratings_hidden BOOLEAN DEFAULT FALSE,
-                ratings_hidden_until TIMESTAMP,
-                comment_count INTEGER DEFAULT 0,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                UNIQUE(creator_id, itch_id)
-            )
-        """)
-
-        # Add columns for existing databases
-        cursor.execute("""
-            ALTER TABLE games ADD COLUMN IF NOT EXISTS ratings_hidden BOOLEAN DEFAULT FALSE
-        """)
-        cursor.execute("""
-            ALTER TABLE games ADD COLUMN IF NOT EXISTS ratings_hidden_until TIMESTAMP
-        """)
-        cursor.execute("""
-            ALTER TABLE games ADD COLUMN IF NOT EXISTS comment_count INTEGER DEFAULT 0
-        """)
-        cursor.execute("""
-            ALTER TABLE games ADD COLUMN IF NOT EXISTS description TEXT
-        """)
-        cursor.execute("""
-            ALTER TABLE games ADD COLUMN IF NOT EXISTS tags TEXT[]
-        """)
-
-        # Migrate from old UNIQUE constraint to composite constraint
-        # Check if old constraint exists and drop it
-        cursor.execute("""
+
+# $n placeholder in a prepared statement, capturing n
+_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+
+def _execute_prepared(cursor, name: str, sql: str, params: tuple) -> None:
+    """Execute a hot statement, preparing it once per connection.
+
+    The first call on a connection runs PREPARE so later calls skip server-side
+    parsing and planning and only send EXECUTE with the parameters.
+
+    Args:
+        cursor: Cursor to execute on
+        name: Statement name, unique per SQL text
+        sql: Statement using $1..$n placeholders
+        params: Values for the placeholders, in order
+    """
+    if not _USE_PREPARED_STATEMENTS:
+        # Each $n becomes its own %s, so reused or reordered placeholders
+        # get the right value
+        order = [int(n) - 1 for n in _PLACEHOLDER_RE.findall(sql)]
+        client_sql = _PLACEHOLDER_RE.sub("%s", sql.replace("%", "%%"))
+        cursor.execute(client_sql, tuple(params[i] for i in order))
+        return
+
+    with _prepared_statements_lock:
+        prepared = _prepared_statements.setdefault(cursor.connection, set())
+
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+
+    placeholders = ", ".join(["%s"] * len(params))
+    cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+
+
+# Schema objects create_tables is responsible for. Keep these in sync when
+# adding tables, migrated columns, or indexes so the fast path stays correct.
+_SCHEMA_TABLES = ("creators", "games", "creator_scores")
+_SCHEMA_GAMES_COLUMNS = (
+    "ratings_hidden", "ratings_hidden_until", "comment_count", "description", "tags", "enrich_claimed_at"
+)
+_SCHEMA_INDEXES = (
+    "idx_games_creator",
+    "idx_scores_bayesian",
+    "idx_games_unenriched",
+    "idx_games_ratings_hidden",
+    "idx_games_missing_metadata",
+    "idx_creators_unbackfilled",
+)
+
+
+# Whole schema as one script, so setting up a database is a single round trip.
+# Each statement is idempotent; the constraint migration runs server-side.
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS creators (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) UNIQUE NOT NULL,
+        profile_url VARCHAR(512) NOT NULL,
+        backfilled BOOLEAN DEFAULT FALSE,
+        first_seen TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    );
+
+    CREATE TABLE IF NOT EXISTS games (
+        id SERIAL PRIMARY KEY,
+        itch_id VARCHAR(255),
+        title VARCHAR(512) NOT NULL,
+        creator_id INTEGER REFERENCES creators(id),
+        url VARCHAR(512) NOT NULL,
+        publish_date DATE,
+        rating DECIMAL(3,2),
+        rating_count INTEGER DEFAULT 0,
+        scraped_at TIMESTAMP,
+        ratings_hidden BOOLEAN DEFAULT FALSE,
+        ratings_hidden_until TIMESTAMP,
+        comment_count INTEGER DEFAULT 0,
+        description TEXT,
+        enrich_claimed_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(creator_id, itch_id)
+    );
+
+    -- Add columns for existing databases
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS ratings_hidden BOOLEAN DEFAULT FALSE;
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS ratings_hidden_until TIMESTAMP;
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS comment_count INTEGER DEFAULT 0;
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS description TEXT;
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS tags TEXT[];
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS enrich_claimed_at TIMESTAMP;
+
+    -- Migrate from old UNIQUE constraint on itch_id to the composite constraint
+    DO $$
+    DECLARE
+        old_constraint TEXT;
+    BEGIN
+        FOR old_constraint IN
             SELECT constraint_name
             FROM information_schema.table_constraints
             WHERE table_name = 'games'
             AND constraint_type = 'UNIQUE'
             AND constraint_name LIKE '%itch_id%'
-        """)
-        old_constraint = cursor.fetchone()
-        if old_constraint:
-            constraint_name = old_constraint[0]
-            cursor.execute(f"""
-                ALTER TABLE games DROP CONSTRAINT IF EXISTS {constraint_name}
-            """)
-
-        # Add new composite unique constraint if it doesn't exist
-        cursor.execute("""
-            SELECT constraint_name
+            AND constraint_name != 'games_creator_id_itch_id_key'
+        LOOP
+            EXECUTE format('ALTER TABLE games DROP CONSTRAINT IF EXISTS %I', old_constraint);
+        END LOOP;
+
+        IF NOT EXISTS (
+            SELECT 1
             FROM information_schema.table_constraints
             WHERE table_name = 'games'
             AND constraint_type = 'UNIQUE'
             AND constraint_name = 'games_creator_id_itch_id_key'
-        """)
-        new_constraint = cursor.fetchone()
-        if not new_constraint:
-            cursor.execute("""
-                ALTER TABLE games ADD CONSTRAINT games_creator_id_itch_id_key UNIQUE(creator_id, itch_id)
-            """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS creator_scores (
-                id SERIAL PRIMARY KEY,
-                creator_id INTEGER REFERENCES creators(id) UNIQUE,
-                game_count INTEGER DEFAULT 0,
-                total_ratings INTEGER DEFAULT 0,
-                avg_rating DECIMAL(3,2),
-                bayesian_score DECIMAL(7,4),
-                calculated_at TIMESTAMP DEFAULT NOW()
+        ) THEN
+            ALTER TABLE games ADD CONSTRAINT games_creator_id_itch_id_key UNIQUE(creator_id, itch_id);
+        END IF;
+    END
+    $$;
+
+    CREATE TABLE IF NOT EXISTS creator_scores (
+        id SERIAL PRIMARY KEY,
+        creator_id INTEGER REFERENCES creators(id) UNIQUE,
+        game_count INTEGER DEFAULT 0,
+        total_ratings INTEGER DEFAULT 0,
+        avg_rating DECIMAL(3,2),
+        bayesian_score DECIMAL(7,4),
+        calculated_at TIMESTAMP DEFAULT NOW()
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_games_creator ON games(creator_id);
+
+    CREATE INDEX IF NOT EXISTS idx_scores_bayesian
+    ON creator_scores(bayesian_score DESC);
+
+    -- Partial indexes covering only the rows the work queues look for
+    CREATE INDEX IF NOT EXISTS idx_games_unenriched
+    ON games(id) WHERE scraped_at IS NULL;
+
+    CREATE INDEX IF NOT EXISTS idx_games_ratings_hidden
+    ON games(id) WHERE ratings_hidden = TRUE;
+
+    CREATE INDEX IF NOT EXISTS idx_games_missing_metadata
+    ON games(id) WHERE title IS NULL OR title = '' OR publish_date IS NULL OR description IS NULL;
+
+    CREATE INDEX IF NOT EXISTS idx_creators_unbackfilled
+    ON creators(id) WHERE backfilled = FALSE;
+"""
+
+
+def _schema_is_current(cursor) -> bool:
+    """Check in one query whether every table, column, constraint and index exists."""
+    cursor.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.tables
+             WHERE table_schema = current_schema() AND table_name = ANY(%s)) = %s
+            AND (SELECT COUNT(*) FROM information_schema.columns
+                 WHERE table_schema = current_schema() AND table_name = 'games'
+                 AND column_name = ANY(%s)) = %s
+            AND (SELECT COUNT(*) FROM pg_indexes
+                 WHERE schemaname = current_schema() AND indexname = ANY(%s)) = %s
+            AND EXISTS (
+                SELECT 1 FROM information_schema.table_constraints
+                WHERE table_name = 'games' AND constraint_type = 'UNIQUE'
+                AND constraint_name = 'games_creator_id_itch_id_key'
             )
-        """)
+            AND NOT EXISTS (
+                SELECT 1 FROM information_schema.table_constraints
+                WHERE table_name = 'games' AND constraint_type = 'UNIQUE'
+                AND constraint_name LIKE '%%itch_id%%'
+                AND constraint_name != 'games_creator_id_itch_id_key'
+            )
+        """,
+        (
+            list(_SCHEMA_TABLES), len(_SCHEMA_TABLES),
+            list(_SCHEMA_GAMES_COLUMNS), len(_SCHEMA_GAMES_COLUMNS),
+            list(_SCHEMA_INDEXES), len(_SCHEMA_INDEXES),
+        )
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_games_creator ON games(creator_id)
-        """)
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_scores_bayesian
-            ON creator_scores(bayesian_score DESC)
-        """)
+def create_tables() -> None:
+    """Initialize database schema.
 
+    Returns early without running any DDL if the schema is already current.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        if _schema_is_current(cursor):
+            cursor.close()
+            return
+
+        cursor.execute(_SCHEMA_SQL)
         cursor.close()
 
 
 def insert_creator(creator: Creator) -> int:
-    """Insert a creator and return their ID."""
+    """Insert a creator and return their ID.
+
+    If the creator already exists, their existing ID is returned by the
+    same statement instead of a follow-up query. The no-op DO UPDATE makes
+    RETURNING see the row even if another transaction just committed it.
+    """
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
             INSERT INTO creators (name, profile_url, backfilled, first_seen)
             VALUES (%s, %s, %s, %s)
-            ON CONFLICT (name) DO NOTHING
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
             RETURNING id
             """,
             (creator.name, creator.profile_url, creator.backfilled, creator.first_seen)
         )
-        result = cursor.fetchone()
+        creator_id = cursor.fetchone()[0]
+        cursor.close()
+
+        _cache_creator_id(creator.name, creator_id)
+        return creator_id
+
+
+def _cache_creator_id(name: str, creator_id: int) -> None:
+    """Remember a creator's ID so later game inserts can skip the lookup."""
+    with _creator_id_cache_lock:
+        _creator_id_cache[name] = creator_id
+
+
+def insert_creators_bulk(creators: list[Creator]) -> dict[str, int]:
+    """Insert a batch of creators and return their IDs keyed by name.
+
+    Creators that already exist keep their data, and their existing IDs
+    are returned by the same statement alongside the new ones, through the
+    same no-op DO UPDATE as insert_creator.
+    """
+    if not creators:
+        return {}
+
+    # One row per name: DO UPDATE can't touch the same row twice in a statement
+    unique_creators = list({creator.name: creator for creator in creators}.values())
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        result = execute_values(
+            cursor,
+            """
+            INSERT INTO creators (name, profile_url, backfilled, first_seen)
+            VALUES %s
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING id, name
+            """,
+            [
+                (creator.name, creator.profile_url, creator.backfilled, creator.first_seen)
+                for creator in unique_creators
+            ],
+            template="(%s::varchar, %s::varchar, %s::boolean, %s::timestamp)",
+            page_size=500,
+            fetch=True
+        )
         cursor.close()
 
-        if result:
-            return result[0]
+    for creator_id, name in result:
+        _cache_creator_id(name, creator_id)
+    return {name: creator_id for creator_id, name in result}
 
-        # If conflict occurred, fetch existing ID
+
+def get_creator_ids(names: list[str]) -> dict[str, int]:
+    """Look up the IDs of existing creators by name in a single query."""
+    if not names:
+        return {}
+
+    with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id FROM creators WHERE name = %s", (creator.name,))
+        cursor.execute("SELECT id, name FROM creators WHERE name = ANY(%s)", (list(names),))
+        rows = cursor.fetchall()
+        cursor.close()
+
+    for creator_id, name in rows:
+        _cache_creator_id(name, creator_id)
+    return {name: creator_id for creator_id, name in rows}
+
+
+# Conflict handling shared by the game insert paths
+_GAMES_UPSERT_SQL = """
+    ON CONFLICT (creator_id, itch_id) DO UPDATE SET
+        title = CASE WHEN EXCLUDED.title != '' THEN EXCLUDED.title ELSE games.title END,
+        publish_date = COALESCE(EXCLUDED.publish_date, games.publish_date)
+    RETURNING id
+"""
+
+
+def insert_game(game: Game, creator_id: int | None = None) -> int:
+    """Insert a game and return its ID.
+
+    If the creator's ID is passed or already cached, the game is inserted
+    directly. Otherwise the creator lookup and the upsert run as one
+    statement. Returns None if the game's creator doesn't exist.
+    """
+    if creator_id is None:
+        creator_id = _creator_id_cache.get(game.creator_name)
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if creator_id is not None:
+            _execute_prepared(
+                cursor,
+                "insert_game",
+                f"""
+                INSERT INTO games (
+                    itch_id, title, creator_id, url, publish_date,
+                    rating, rating_count, scraped_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                {_GAMES_UPSERT_SQL}
+                """,
+                (
+                    game.itch_id, game.title, creator_id, game.url,
+                    game.publish_date, game.rating, game.rating_count, game.scraped_at
+                )
+            )
+        else:
+            cursor.execute(
+                f"""
+                INSERT INTO games (
+                    itch_id, title, creator_id, url, publish_date,
+                    rating, rating_count, scraped_at
+                )
+                SELECT %s, %s, c.id, %s, %s, %s, %s, %s
+                FROM creators c
+                WHERE c.name = %s
+                {_GAMES_UPSERT_SQL}
+                """,
+                (
+                    game.itch_id, game.title, game.url, game.publish_date,
+                    game.rating, game.rating_count, game.scraped_at, game.creator_name
+                )
+            )
         result = cursor.fetchone()
         cursor.close()
         return result[0] if result else None
 
 
-def insert_game(game: Game) -> int:
-    """Insert a game and return its ID."""
+def insert_games_bulk(
+    games: list[Game],
+    creator_id: int,
+    mark_backfilled: bool = False
+) -> list[int]:
+    """Insert a batch of games for one creator and return their IDs.
+
+    Small batches are sent as column-parallel arrays that Postgres unnests,
+    so the whole batch is parsed and planned as a single statement. Large
+    batches are streamed into a temporary table with COPY and merged from
+    there. Conflicts are handled the same way as insert_game.
+
+    Args:
+        games: Games to insert (creator_name is ignored)
+        creator_id: ID of the creator that owns every game in the batch
+        mark_backfilled: Also mark the creator as backfilled in the same statement
+    """
+    if not games:
+        return []
+
+    # A single INSERT cannot upsert the same row twice, so collapse duplicates
+    unique_games = list({game.itch_id: game for game in games}.values())
+
+    # Optionally fold mark_creator_backfilled into the INSERT as a CTE
+    mark_sql = ""
+    mark_params: tuple = ()
+    if mark_backfilled:
+        mark_sql = """
+            WITH marked AS (
+                UPDATE creators SET backfilled = TRUE, updated_at = NOW() WHERE id = %s
+            )
+        """
+        mark_params = (creator_id,)
+
     with get_connection() as conn:
         cursor = conn.cursor()
+        if len(unique_games) >= _COPY_THRESHOLD:
+            _copy_games_to_stage(cursor, unique_games)
+            cursor.execute(
+                f"""
+                {mark_sql}
+                INSERT INTO games (
+                    itch_id, title, creator_id, url, publish_date,
+                    rating, rating_count, scraped_at
+                )
+                SELECT itch_id, title, %s, url, publish_date, rating, rating_count, scraped_at
+                FROM games_stage
+                {_GAMES_UPSERT_SQL}
+                """,
+                mark_params + (creator_id,)
+            )
+            result = cursor.fetchall()
+            cursor.execute("DROP TABLE games_stage")
+        else:
+            cursor.execute(
+                f"""
+                {mark_sql}
+                INSERT INTO games (
+                    itch_id, title, creator_id, url, publish_date,
+                    rating, rating_count, scraped_at
+                )
+                SELECT itch_id, title, %s, url, publish_date, rating, rating_count, scraped_at
+                FROM unnest(
+                    %s::text[], %s::text[], %s::text[], %s::date[],
+                    %s::numeric[], %s::int[], %s::timestamp[]
+                ) AS batch(itch_id, title, url, publish_date, rating, rating_count, scraped_at)
+                {_GAMES_UPSERT_SQL}
+                """,
+                mark_params + (
+                    creator_id,
+                    [game.itch_id for game in unique_games],
+                    [game.title for game in unique_games],
+                    [game.url for game in unique_games],
+                    [game.publish_date for game in unique_games],
+                    [game.rating for game in unique_games],
+                    [game.rating_count for game in unique_games],
+                    [game.scraped_at for game in unique_games],
+                )
+            )
+            result = cursor.fetchall()
+        cursor.close()
+        return [row[0] for row in result]
 
-        # First get creator_id
-        cursor.execute("SELECT id FROM creators WHERE name = %s", (game.creator_name,))
-        creator_result = cursor.fetchone()
-        creator_id = creator_result[0] if creator_result else None
-        if creator_id is None:
-            cursor.close()
-            return None
 
+def insert_games_for_creators(games: list[Game], creator_ids: dict[str, int]) -> list[int]:
+    """Insert games from many creators in one statement and return their IDs.
+
+    Like insert_games_bulk, but each game's creator is looked up by
+    creator_name in creator_ids. Games whose creator isn't there are skipped.
+
+    Args:
+        games: Games to insert
+        creator_ids: Creator name -> ID, e.g. from get_creator_ids
+    """
+    # A single INSERT cannot upsert the same row twice, so collapse duplicates
+    unique_games = {
+        (creator_ids[game.creator_name], game.itch_id): game
+        for game in games
+        if game.creator_name in creator_ids
+    }
+    if not unique_games:
+        return []
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             INSERT INTO games (
                 itch_id, title, creator_id, url, publish_date,
                 rating, rating_count, scraped_at
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (creator_id, itch_id) DO UPDATE SET
-                title = CASE WHEN EXCLUDED.title != '' THEN EXCLUDED.title ELSE games.title END,
-                publish_date = COALESCE(EXCLUDED.publish_date, games.publish_date)
-            RETURNING id
+            SELECT itch_id, title, creator_id, url, publish_date, rating, rating_count, scraped_at
+            FROM unnest(
+                %s::int[], %s::text[], %s::text[], %s::text[], %s::date[],
+                %s::numeric[], %s::int[], %s::timestamp[]
+            ) AS batch(creator_id, itch_id, title, url, publish_date, rating, rating_count, scraped_at)
+            {_GAMES_UPSERT_SQL}
             """,
             (
-                game.itch_id, game.title, creator_id, game.url,
-                game.publish_date, game.rating, game.rating_count, game.scraped_at
+                [creator_id for creator_id, _ in unique_games],
+                [game.itch_id for game in unique_games.values()],
+                [game.title for game in unique_games.values()],
+                [game.url for game in unique_games.values()],
+                [game.publish_date for game in unique_games.values()],
+                [game.rating for game in unique_games.values()],
+                [game.rating_count for game in unique_games.values()],
+                [game.scraped_at for game in unique_games.values()],
             )
         )
-        result = cursor.fetchone()
+        result = cursor.fetchall()
         cursor.close()
+        return [row[0] for row in result]
 
-        if result:
-            return result[0]
 
-        # If conflict occurred, fetch existing ID
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id FROM games WHERE creator_id = %s AND itch_id = %s",
-            (creator_id, game.itch_id)
+def _copy_games_to_stage(cursor, games: list[Game]) -> None:
+    """Stream games into a temporary games_stage table with COPY."""
+    cursor.execute("""
+        CREATE TEMP TABLE games_stage (
+            itch_id TEXT,
+            title TEXT,
+            url TEXT,
+            publish_date DATE,
+            rating NUMERIC,
+            rating_count INTEGER,
+            scraped_at TIMESTAMP
         )
-        result = cursor.fetchone()
-        cursor.close()
-        return result[0] if result else None
+    """)
+
+    buffer = io.StringIO()
+    for game in games:
+        buffer.write(",".join(_csv_field(value) for value in (
+            game.itch_id, game.title, game.url, game.publish_date,
+            game.rating, game.rating_count, game.scraped_at
+        )))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor.copy_expert(
+        """
+        COPY games_stage (itch_id, title, url, publish_date, rating, rating_count, scraped_at)
+        FROM STDIN WITH (FORMAT CSV)
+        """,
+        buffer
+    )
+
+
+def _csv_field(value: object) -> str:
+    """Format a value for COPY CSV input.
+
+    Unquoted empty fields are read as NULL, so strings are always quoted to
+    keep empty titles distinct from missing ones.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+# Columns selected for Creator rows, in the order _creator_from_row unpacks them
+_CREATOR_COLUMNS_SQL = "id, name, profile_url, backfilled, first_seen"
 
 
 def get_creator_by_name(name: str) -> Creator | None:
     """Fetch a creator by name."""
     with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SELECT * FROM creators WHERE name = %s", (name,))
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {_CREATOR_COLUMNS_SQL} FROM creators WHERE name = %s", (name,))
         row = cursor.fetchone()
         cursor.close()
 
         if not row:
             return None
 
-        return Creator(
-            id=row["id"],
-            name=row["name"],
-            profile_url=row["profile_url"],
-            backfilled=row["backfilled"],
-            first_seen=row["first_seen"]
-        )
+        creator = _creator_from_row(row)
+        _cache_creator_id(creator.name, creator.id)
+        return creator
 
 
-def get_unbackfilled_creators() -> list[Creator]:
-    """Fetch all creators that haven't been backfilled."""
-    with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SELECT * FROM creators WHERE backfilled = FALSE")
-        rows = cursor.fetchall()
-        cursor.close()
+def get_unbackfilled_creators() -> Iterator[Creator]:
+    """Stream all creators that haven't been backfilled, in ID order.
 
-        return [
-            Creator(
-                id=row["id"],
-                name=row["name"],
-                profile_url=row["profile_url"],
-                backfilled=row["backfilled"],
-                first_seen=row["first_seen"]
+    Rows are fetched in batches of _STREAM_BATCH_SIZE using keyset
+    pagination, so memory stays flat and no connection is held while the
+    caller works through each batch.
+    """
+    last_id = 0
+    while True:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {_CREATOR_COLUMNS_SQL} FROM creators
+                WHERE backfilled = FALSE AND id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, _STREAM_BATCH_SIZE)
             )
-            for row in rows
-        ]
+            rows = cursor.fetchall()
+            cursor.close()
+
+        for row in rows:
+            yield _creator_from_row(row)
+
+        if len(rows) < _STREAM_BATCH_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def _creator_from_row(row: tuple) -> Creator:
+    """Build a Creator from a row selected with _CREATOR_COLUMNS_SQL."""
+    creator_id, name, profile_url, backfilled, first_seen = row
+    return Creator(
+        id=creator_id,
+        name=name,
+        profile_url=profile_url,
+        backfilled=backfilled,
+        first_seen=first_seen
+    )
+
+
+# Columns selected for Game rows, in the order _game_from_row unpacks them.
+# rating is cast server-side so the driver returns a float, not a Decimal.
+_GAME_COLUMNS_SQL = """
+    g.id, g.itch_id, g.title, c.name, g.url, g.publish_date, g.rating::float8,
+    g.rating_count, g.comment_count, g.description, g.tags, g.scraped_at
+"""
 
 
 def get_unenriched_games(
     limit: int | None = None,
     backfill_missing_metadata: bool = True
-) -> list[Game]:
-    """Fetch games that haven't been scraped for ratings or need re-enrichment.
+) -> Iterator[Game]:
+    """Stream games that haven't been scraped for ratings or need re-enrichment.
+
+    Games are yielded in ID order and fetched in batches the same way as
+    get_unbackfilled_creators. Each reason a game can need enrichment is
+    queried as its own branch so it can walk its matching partial index,
+    and the branches' IDs are merged before joining the full rows.
+
+    Each batch is claimed by setting enrich_claimed_at, so enrich workers
+    running in parallel don't fetch the same games. The claim is cleared when
+    ratings are written or the game is marked failed, and expires after
+    _ENRICH_CLAIM_TTL_MINUTES if its worker dies in between.
 
     Args:
         limit: Maximum number of games to return. None for unlimited.
         backfill_missing_metadata: Include games missing required metadata fields.
     """
-    with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        where_clauses = [
-            "(g.scraped_at IS NULL AND (g.ratings_hidden = FALSE OR g.ratings_hidden IS NULL OR g.ratings_hidden_until IS NULL OR g.ratings_hidden_until < NOW()))",
-            "(g.ratings_hidden = TRUE AND g.ratings_hidden_until < NOW())",
-        ]
-        if backfill_missing_metadata:
-            where_clauses.append(
-                "(g.title IS NULL OR g.title = '' OR g.publish_date IS NULL OR g.description IS NULL) "
-                "AND (g.ratings_hidden = FALSE OR g.ratings_hidden IS NULL OR g.ratings_hidden_until IS NULL OR g.ratings_hidden_until < NOW())"
-            )
+    ratings_visible = (
+        "(g.ratings_hidden = FALSE OR g.ratings_hidden IS NULL "
+        "OR g.ratings_hidden_until IS NULL OR g.ratings_hidden_until < NOW())"
+    )
+    unclaimed = (
+        "(g.enrich_claimed_at IS NULL "
+        f"OR g.enrich_claimed_at < NOW() - INTERVAL '{_ENRICH_CLAIM_TTL_MINUTES} minutes')"
+    )
+    where_clauses = [
+        f"g.scraped_at IS NULL AND {ratings_visible}",
+        "g.ratings_hidden = TRUE AND g.ratings_hidden_until < NOW()",
+    ]
+    if backfill_missing_metadata:
+        where_clauses.append(
+            "(g.title IS NULL OR g.title = '' OR g.publish_date IS NULL OR g.description IS NULL) "
+            f"AND {ratings_visible}"
+        )
 
-        query = f"""
-            SELECT g.*, c.name as creator_name
-            FROM games g
-            LEFT JOIN creators c ON g.creator_id = c.id
-            WHERE {" OR ".join(f"({clause})" for clause in where_clauses)}
+    branches = "\n            UNION\n".join(
+        f"""            (SELECT g.id FROM games g
+             WHERE {clause} AND {unclaimed} AND g.id > %s
+             ORDER BY g.id LIMIT %s)"""
+        for clause in where_clauses
+    )
+    # Rows are locked while the batch is claimed and skipped if another worker
+    # holds them.
+    query = f"""
+        WITH claimed AS (
+            SELECT g.id FROM games g
+            WHERE g.id IN (
+{branches}
+            )
             ORDER BY g.id
-        """
-        params: list[object] = []
-        if limit is not None:
-            query += " LIMIT %s"
-            params.append(limit)
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        cursor.close()
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ), claim AS (
+            UPDATE games SET enrich_claimed_at = NOW()
+            FROM claimed
+            WHERE games.id = claimed.id
+        )
+        SELECT {_GAME_COLUMNS_SQL}
+        FROM games g
+        JOIN claimed ON claimed.id = g.id
+        LEFT JOIN creators c ON g.creator_id = c.id
+        ORDER BY g.id
+    """
 
-        return [
-            Game(
-                id=row["id"],
-                itch_id=row["itch_id"],
-                title=row["title"],
-                creator_name=row["creator_name"] if row["creator_name"] else "unknown",
-                url=row["url"],
-                publish_date=row["publish_date"],
-                rating=float(row["rating"]) if row["rating"] is not None else None,
-                rating_count=row["rating_count"],
-                comment_count=row["comment_count"] if row["comment_count"] is not None else 0,
-                description=row["description"],
-                tags=list(row["tags"]) if row["tags"] else None,
-                scraped_at=row["scraped_at"]
-            )
-            for row in rows
-        ]
+    last_id = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        batch_size = _STREAM_BATCH_SIZE if remaining is None else min(_STREAM_BATCH_SIZE, remaining)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (last_id, batch_size) * len(where_clauses) + (batch_size,))
+            rows = cursor.fetchall()
+            cursor.close()
+
+        # A short batch can just mean other workers hold some rows, so only
+        # an empty one ends the stream
+        if not rows:
+            return
+
+        for row in rows:
+            yield _game_from_row(row)
+
+        last_id = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def _game_from_row(row: tuple) -> Game:
+    """Build a Game from a row selected with _GAME_COLUMNS_SQL."""
+    (
+        game_id, itch_id, title, creator_name, url, publish_date, rating,
+        rating_count, comment_count, description, tags, scraped_at
+    ) = row
+    return Game(
+        id=game_id,
+        itch_id=itch_id,
+        title=title,
+        creator_name=creator_name if creator_name else "unknown",
+        url=url,
+        publish_date=publish_date,
+        rating=rating,
+        rating_count=rating_count,
+        comment_count=comment_count if comment_count is not None else 0,
+        description=description,
+        tags=list(tags) if tags else None,
+        scraped_at=scraped_at
+    )
 
 
 def get_stale_games(days_old: int = 7, limit: int = 500) -> list[Game]:
     """Fetch games that were enriched more than X days ago and need refreshing."""
     with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT g.*, c.name as creator_name
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {_GAME_COLUMNS_SQL}
             FROM games g
             LEFT JOIN creators c ON g.creator_id = c.id
             WHERE g.scraped_at IS NOT NULL
@@ -344,23 +873,7 @@ def get_stale_games(days_old: int = 7, limit: int = 500) -> list[Game]:
         rows = cursor.fetchall()
         cursor.close()
 
-        return [
-            Game(
-                id=row["id"],
-                itch_id=row["itch_id"],
-                title=row["title"],
-                creator_name=row["creator_name"] if row["creator_name"] else "unknown",
-                url=row["url"],
-                publish_date=row["publish_date"],
-                rating=float(row["rating"]) if row["rating"] is not None else None,
-                rating_count=row["rating_count"],
-                comment_count=row["comment_count"] if row["comment_count"] is not None else 0,
-                description=row["description"],
-                tags=list(row["tags"]) if row["tags"] else None,
-                scraped_at=row["scraped_at"]
-            )
-            for row in rows
-        ]
+        return [_game_from_row(row) for row in rows]
 
 
 def update_game_ratings(
@@ -392,30 +905,86 @@ def update_game_ratings(
         if ratings_hidden:
             # Set retry cooldown (7 days) without marking as fully scraped
             # Still update comment_count, description, title, and tags as they're always available
-            cursor.execute(
+            _execute_prepared(
+                cursor,
+                "update_game_ratings_hidden",
                 """
                 UPDATE games
                 SET ratings_hidden = TRUE, ratings_hidden_until = NOW() + INTERVAL '7 days',
-                    rating_count = %s, comment_count = %s, description = %s, tags = %s,
-                    publish_date = COALESCE(publish_date, %s),
-                    title = CASE WHEN title = '' OR title IS NULL THEN %s ELSE title END
-                WHERE id = %s
+                    enrich_claimed_at = NULL, rating_count = $1, comment_count = $2, description = $3, tags = $4,
+                    publish_date = COALESCE(publish_date, $5),
+                    title = CASE WHEN title = '' OR title IS NULL THEN $6 ELSE title END
+                WHERE id = $7
                 """,
                 (rating_count, comment_count, description, tags, publish_date.date() if publish_date else None, title, game_id)
             )
         else:
-            cursor.execute(
+            _execute_prepared(
+                cursor,
+                "update_game_ratings",
                 """
                 UPDATE games
-                SET rating = %s, rating_count = %s, comment_count = %s, description = %s, tags = %s,
-                    publish_date = COALESCE(publish_date, %s),
-                    title = CASE WHEN title = '' OR title IS NULL THEN %s ELSE title END,
-                    scraped_at = %s, ratings_hidden = FALSE, ratings_hidden_until = NULL
-                WHERE id = %s
+                SET rating = $1, rating_count = $2, comment_count = $3, description = $4, tags = $5,
+                    publish_date = COALESCE(publish_date, $6),
+                    title = CASE WHEN title = '' OR title IS NULL THEN $7 ELSE title END,
+                    scraped_at = NOW(), ratings_hidden = FALSE, ratings_hidden_until = NULL,
+                    enrich_claimed_at = NULL
+                WHERE id = $8
                 """,
                 (rating, rating_count, comment_count, description, tags,
-                 publish_date.date() if publish_date else None, title, datetime.now(), game_id)
+                 publish_date.date() if publish_date else None, title, game_id)
+            )
+        cursor.close()
+
+
+def update_game_ratings_bulk(updates: list[GameRatingUpdate]) -> None:
+    """Apply many update_game_ratings calls in a single UPDATE ... FROM (VALUES ...).
+
+    Each update follows the same rules as update_game_ratings, including the
+    7-day retry cooldown for games whose ratings are hidden.
+
+    Args:
+        updates: Rating updates to apply, at most one per game
+    """
+    if not updates:
+        return
+
+    rows = [
+        (
+            update.game_id, update.rating, update.rating_count, update.comment_count,
+            update.description, update.publish_date.date() if update.publish_date else None,
+            update.title, update.tags, update.ratings_hidden
+        )
+        for update in updates
+    ]
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        execute_values(
+            cursor,
+            """
+            UPDATE games AS g
+            SET rating = CASE WHEN v.ratings_hidden THEN g.rating ELSE v.rating END,
+                rating_count = v.rating_count, comment_count = v.comment_count,
+                description = v.description, tags = v.tags,
+                publish_date = COALESCE(g.publish_date, v.publish_date),
+                title = CASE WHEN g.title = '' OR g.title IS NULL THEN v.title ELSE g.title END,
+                scraped_at = CASE WHEN v.ratings_hidden THEN g.scraped_at ELSE NOW() END,
+                ratings_hidden = v.ratings_hidden,
+                ratings_hidden_until = CASE
+                    WHEN v.ratings_hidden THEN NOW() + INTERVAL '7 days' ELSE NULL
+                END,
+                enrich_claimed_at = NULL
+            FROM (VALUES %s) AS v(
+                id, rating, rating_count, comment_count, description,
+                publish_date, title, tags, ratings_hidden
             )
+            WHERE g.id = v.id
+            """,
+            rows,
+            template="(%s::int, %s::numeric, %s::int, %s::int, %s::text, %s::date, %s::text, %s::text[], %s::boolean)",
+            page_size=500
+        )
         cursor.close()
 
 
@@ -430,24 +999,46 @@ def mark_game_failed(game_id: int, cooldown_days: int = 7) -> None:
     """
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
+        _execute_prepared(
+            cursor,
+            "mark_game_failed",
             """
             UPDATE games
-            SET ratings_hidden = TRUE, ratings_hidden_until = NOW() + make_interval(days => %s)
-            WHERE id = %s
+            SET ratings_hidden = TRUE, ratings_hidden_until = NOW() + make_interval(days => $1),
+                enrich_claimed_at = NULL
+            WHERE id = $2
             """,
             (cooldown_days, game_id)
         )
         cursor.close()
 
 
+def mark_games_failed(game_ids: list[int], cooldown_days: int = 7) -> None:
+    """Mark several games as failed in one statement. See mark_game_failed."""
+    if not game_ids:
+        return
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            UPDATE games
+            SET ratings_hidden = TRUE, ratings_hidden_until = NOW() + make_interval(days => %s),
+                enrich_claimed_at = NULL
+            WHERE id = ANY(%s)
+            """,
+            (cooldown_days, list(game_ids))
+        )
+        cursor.close()
+
+
 def mark_creator_backfilled(creator_id: int) -> None:
     """Mark a creator as backfilled."""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "UPDATE creators SET backfilled = TRUE, updated_at = %s WHERE id = %s",
-            (datetime.now(), creator_id)
+            "UPDATE creators SET backfilled = TRUE, updated_at = NOW() WHERE id = %s",
+            (creator_id,)
         )
         cursor.close()
 
@@ -456,12 +1047,14 @@ def upsert_creator_score(score: CreatorScore) -> None:
     """Insert or update a creator's score."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
+        _execute_prepared(
+            cursor,
+            "upsert_creator_score",
             """
             INSERT INTO creator_scores (
                 creator_id, game_count, total_ratings, avg_rating, bayesian_score, calculated_at
             )
-            VALUES (%s, %s, %s, %s, %s, %s)
+            VALUES ($1, $2, $3, $4, $5, NOW())
             ON CONFLICT (creator_id) DO UPDATE SET
                 game_count = EXCLUDED.game_count,
                 total_ratings = EXCLUDED.total_ratings,
@@ -471,7 +1064,45 @@ def upsert_creator_score(score: CreatorScore) -> None:
             """,
             (
                 score.creator_id, score.game_count, score.total_ratings,
-                score.avg_rating, score.bayesian_score, datetime.now()
+                score.avg_rating, score.bayesian_score
             )
         )
         cursor.close()
+
+
+def upsert_creator_scores_bulk(scores: list[CreatorScore]) -> None:
+    """Insert or update many creators' scores in one statement. See upsert_creator_score.
+
+    Args:
+        scores: Scores to write, at most one per creator
+    """
+    if not scores:
+        return
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        execute_values(
+            cursor,
+            """
+            INSERT INTO creator_scores (
+                creator_id, game_count, total_ratings, avg_rating, bayesian_score, calculated_at
+            )
+            VALUES %s
+            ON CONFLICT (creator_id) DO UPDATE SET
+                game_count = EXCLUDED.game_count,
+                total_ratings = EXCLUDED.total_ratings,
+                avg_rating = EXCLUDED.avg_rating,
+                bayesian_score = EXCLUDED.bayesian_score,
+                calculated_at = EXCLUDED.calculated_at
+            """,
+            [
+                (
+                    score.creator_id, score.game_count, score.total_ratings,
+                    score.avg_rating, score.bayesian_score
+                )
+                for score in scores
+            ],
+            template="(%s, %s, %s, %s, %s, NOW())",
+            page_size=500
+        )
+        cursor.close()
@@ -1,18 +1,36 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable
+
 from . import db
 from .http_client import fetch
 from .logger import setup_logger, log_error_with_context
-from .models import Game
+from .models import Game, GameRatingUpdate
 from .parsers import game as game_parser
 
 logger = setup_logger(__name__)
 
 
-def enrich_game(game: Game) -> bool:
+# Rating updates buffered before being written in one statement and commit
+_UPDATE_BATCH_SIZE = 100
+
+# Games enriched concurrently. Requests are still globally rate limited
+# by http_client, so this only needs to cover slow responses.
+_ENRICH_WORKERS = 4
+
+
+def enrich_game(
+    game: Game,
+    updates: list[GameRatingUpdate] | None = None,
+    force_refresh: bool = False
+) -> bool:
     """
     Fetch a game's page and update its rating information.
 
     Args:
         game: Game object to enrich
+        updates: If given, the update is appended here for the caller to
+            write in bulk instead of being written immediately
+        force_refresh: Revalidate the page even if a cached copy is still fresh
 
     Returns:
         True if successful, False otherwise
@@ -21,7 +39,7 @@ def enrich_game(game: Game) -> bool:
         Exception: If page fetching fails
     """
     # Fetch the game page
-    html = fetch(game.url)
+    html = fetch(game.url, force_refresh=force_refresh)
 
     # Parse ratings from page
     rating_data = game_parser.parse_game(html)
@@ -32,8 +50,7 @@ def enrich_game(game: Game) -> bool:
     parse_failed = rating_data["rating"] is None and rating_data["rating_count"] > 0
     ratings_hidden = rating_data["rating"] is None
 
-    # Update in database
-    db.update_game_ratings(
+    update = GameRatingUpdate(
         game_id=game.id,
         rating=rating_data["rating"],
         rating_count=rating_data["rating_count"],
@@ -45,6 +62,22 @@ def enrich_game(game: Game) -> bool:
         ratings_hidden=ratings_hidden
     )
 
+    # Update in database
+    if updates is not None:
+        updates.append(update)
+    else:
+        db.update_game_ratings(
+            game_id=update.game_id,
+            rating=update.rating,
+            rating_count=update.rating_count,
+            comment_count=update.comment_count,
+            description=update.description,
+            publish_date=update.publish_date,
+            title=update.title,
+            tags=update.tags,
+            ratings_hidden=update.ratings_hidden
+        )
+
     if parse_failed:
         raise ValueError("Rating parse failed (rating_count present, rating missing)")
 
@@ -67,16 +100,7 @@ def enrich_all(limit: int | None = None) -> dict[str, int]:
     }
 
     games = db.get_unenriched_games(limit=limit)
-
-    for game in games:
-        try:
-            enrich_game(game)
-            stats["games_processed"] += 1
-        except Exception as e:
-            stats["errors"] += 1
-            log_error_with_context(logger, "Enrich", f"{game.title} ({game.url})", e)
-            # Mark failed games with cooldown to prevent infinite retry loops
-            db.mark_game_failed(game.id)
+    _enrich_games(games, "Enrich", stats)
 
     return stats
 
@@ -100,14 +124,107 @@ def re_enrich_stale(days_old: int = 7, limit: int = 500) -> dict[str, int]:
     games = db.get_stale_games(days_old=days_old, limit=limit)
     logger.info(f"Found {len(games)} stale games to re-enrich")
 
-    for game in games:
+    # Ratings are what changed, so don't trust a page the cache still calls fresh
+    _enrich_games(games, "Re-enrich", stats, force_refresh=True)
+
+    return stats
+
+
+def _enrich_games(
+    games: Iterable[Game],
+    operation: str,
+    stats: dict[str, int],
+    force_refresh: bool = False
+) -> None:
+    """
+    Enrich games on a small thread pool, writing their results in batches.
+
+    Rating updates and failure cooldowns are collected on the calling
+    thread and flushed together every _UPDATE_BATCH_SIZE games, and once
+    more at the end even if the loop is interrupted.
+
+    Args:
+        games: Games to enrich
+        operation: Name used when logging errors
+        stats: Dictionary with games_processed and errors counts to update
+        force_refresh: Passed through to enrich_game
+    """
+    pending: list[GameRatingUpdate] = []
+    failed_ids: list[int] = []
+
+    def collect(future: Future, game: Game, game_updates: list[GameRatingUpdate]) -> None:
+        nonlocal pending, failed_ids
         try:
-            enrich_game(game)
+            future.result()
             stats["games_processed"] += 1
         except Exception as e:
             stats["errors"] += 1
-            log_error_with_context(logger, "Re-enrich", f"{game.title} ({game.url})", e)
+            log_error_with_context(logger, operation, f"{game.title} ({game.url})", e)
             # Mark failed games with cooldown to prevent infinite retry loops
-            db.mark_game_failed(game.id)
+            failed_ids.append(game.id)
+        # A game whose ratings failed to parse still has its update written
+        pending.extend(game_updates)
+
+        if len(pending) + len(failed_ids) >= _UPDATE_BATCH_SIZE:
+            batch, pending = pending, []
+            failed_batch, failed_ids = failed_ids, []
+            _write_results(batch, failed_batch)
+
+    try:
+        # Keep a bounded number of games in flight so the streamed game
+        # list is never fully materialized
+        with ThreadPoolExecutor(max_workers=_ENRICH_WORKERS) as executor:
+            in_flight: dict[Future, tuple[Game, list[GameRatingUpdate]]] = {}
+            for game in games:
+                game_updates: list[GameRatingUpdate] = []
+                in_flight[executor.submit(enrich_game, game, game_updates, force_refresh)] = (game, game_updates)
+                if len(in_flight) >= _ENRICH_WORKERS * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, *in_flight.pop(future))
+
+            for future in list(in_flight):
+                collect(future, *in_flight.pop(future))
+    finally:
+        _write_results(pending, failed_ids)
+
+
+def _write_results(updates: list[GameRatingUpdate], failed_ids: list[int]) -> None:
+    """Write buffered rating updates, then failure cooldowns.
+
+    If the batched update fails, its games are retried one at a time so a
+    single bad row only fails that game. Games that still can't be written
+    get a failure cooldown. Cooldowns are committed on their own, so they
+    are written even if the rating updates fail.
+    """
+    failed_ids = list(failed_ids)
+    try:
+        try:
+            db.update_game_ratings_bulk(updates)
+        except Exception as e:
+            logger.warning(f"Batched rating update failed, retrying {len(updates)} games one at a time: {e}")
+            failed_ids.extend(_write_updates_individually(updates))
+    finally:
+        db.mark_games_failed(failed_ids)
 
-    return stats
+
+def _write_updates_individually(updates: list[GameRatingUpdate]) -> list[int]:
+    """Write rating updates one game at a time and return the IDs that failed."""
+    failed_ids = []
+    for update in updates:
+        try:
+            db.update_game_ratings(
+                update.game_id,
+                update.rating,
+                update.rating_count,
+                comment_count=update.comment_count,
+                description=update.description,
+                publish_date=update.publish_date,
+                title=update.title,
+                tags=update.tags,
+                ratings_hidden=update.ratings_hidden
+            )
+        except Exception as e:
+            log_error_with_context(logger, "Update ratings", f"game {update.game_id}", e)
+            failed_ids.append(update.game_id)
+    return failed_ids
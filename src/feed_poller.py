@@ -1,13 +1,24 @@
-from datetime import datetime
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
 from typing import TypedDict
 
-import feedparser
+from lxml import etree
 
 from .http_client import fetch
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Feeds fetched concurrently. Requests are still globally rate limited
+# by http_client, so this only overlaps slow responses.
+_POLL_WORKERS = 4
+
+# Subdomain of a creator.itch.io URL, with or without a scheme
+_ITCH_HOST_RE = re.compile(r"(?:https?://)?([^./:]+)\.itch\.io(?:[/:?#]|$)")
+
 
 class FeedEntry(TypedDict):
     """Represents a game from an RSS feed."""
@@ -67,48 +78,93 @@ def poll_feed(feed_url: str) -> list[FeedEntry]:
         List of dictionaries containing game information
     """
     xml_content = fetch(feed_url)
-    feed = feedparser.parse(xml_content)
 
     entries: list[FeedEntry] = []
 
-    for entry in feed.entries:
-        # Defensive: check if required fields exist
-        if not hasattr(entry, "link") or not hasattr(entry, "title"):
+    # Stream <item> elements instead of building the whole document, and
+    # recover from the occasional malformed byte like a browser would.
+    # fetch() has already decoded the body, so the UTF-8 re-encoding
+    # overrides whatever encoding the XML declaration names.
+    items = etree.iterparse(
+        BytesIO(xml_content.encode("utf-8")), events=("end",), tag="item",
+        recover=True, encoding="utf-8"
+    )
+
+    for _, item in items:
+        title = item.findtext("title")
+        link = (item.findtext("link") or "").strip()
+        pub_date = item.findtext("pubDate")
+
+        # Free the parsed item, and any siblings before it, as we go
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+        # Defensive: check if required fields exist. An empty title is kept
+        # and filled in later by enrichment.
+        if not link or title is None:
             logger.warning("Skipping malformed feed entry (missing link or title)")
             continue
 
         # Extract creator from the link
         # itch.io URLs are typically: https://{creator}.itch.io/{game}
-        creator = _extract_creator_from_url(entry.link)
-
-        # Parse publish date if available
-        publish_date = None
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            publish_date = datetime(*entry.published_parsed[:6])
+        creator = _extract_creator_from_url(link)
 
         entries.append({
-            "title": entry.title,
+            "title": title.strip(),
             "creator": creator,
-            "game_url": entry.link,
-            "publish_date": publish_date,
+            "game_url": link,
+            "publish_date": _parse_pub_date(pub_date),
         })
 
     return entries
 
 
+def _parse_pub_date(text: str | None) -> datetime | None:
+    """
+    Parse an RSS pubDate into a naive UTC datetime.
+
+    Example:
+        "Mon, 01 Jan 2024 12:00:00 GMT" -> datetime(2024, 1, 1, 12, 0)
+
+    Args:
+        text: RFC 822 date text, or None if the item has no pubDate
+
+    Returns:
+        Datetime in UTC without tzinfo, or None if missing or unparseable
+    """
+    if not text:
+        return None
+
+    try:
+        parsed = parsedate_to_datetime(text.strip())
+    except (TypeError, ValueError):
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 def get_new_releases() -> list[FeedEntry]:
     """
     Poll default itch.io feeds for new game releases.
 
+    Feeds are fetched on a small thread pool and merged in _default_feeds
+    order.
+
     Returns:
         Combined list of games from all feeds (deduplicated by URL)
     """
     all_entries: list[FeedEntry] = []
     seen_urls: set[str] = set()
 
-    for feed_url in _default_feeds:
-        entries = poll_feed(feed_url)
+    with ThreadPoolExecutor(max_workers=_POLL_WORKERS) as executor:
+        # map() yields results in _default_feeds order, so deduplication
+        # doesn't depend on which fetch finishes first
+        feeds = list(executor.map(poll_feed, _default_feeds))
 
+    for entries in feeds:
         for entry in entries:
             # Deduplicate by URL
             if entry["game_url"] not in seen_urls:
@@ -132,17 +188,11 @@ def _extract_creator_from_url(url: str) -> str | None:
     Returns:
         Creator username, or None if URL format is unrecognized
     """
-    # Remove protocol
-    without_protocol = url.split("://", 1)[-1]
-
-    # Get the subdomain (creator name)
-    parts = without_protocol.split(".")
+    match = _ITCH_HOST_RE.match(url)
 
-    # Standard subdomain format: creator.itch.io
-    if len(parts) >= 3 and parts[1] == "itch" and parts[2].startswith("io"):
-        # Check if it's not just "itch.io" or "www.itch.io" (no valid subdomain)
-        if parts[0] and parts[0] not in ["www", "itch"]:
-            return parts[0]
+    # Check it's not just "itch.io" or "www.itch.io" (no valid subdomain)
+    if match and match.group(1) not in ("www", "itch"):
+        return match.group(1)
 
     # Unrecognized URL format - return None instead of collapsing to "unknown"
     return None
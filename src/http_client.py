@@ -1,23 +1,44 @@
+import atexit
+import hashlib
+import json
+import os
 import random
+import re
+import threading
 import time
+from email.utils import parsedate_to_datetime
 from typing import Optional
 
 import httpx
 
 
-# Track last request time for rate limiting
+# Monotonic start time of the latest reserved request, for rate limiting (shared across threads)
 _last_request_time: Optional[float] = None
+_rate_limit_lock = threading.Lock()
 _min_delay_seconds = 1.0
+_max_backoff_seconds = 60.0
 _user_agent = "itch-creators-scraper/1.0 (Educational project for ranking game creators)"
 
+# Shared client so requests to itch.io reuse keep-alive connections
+# instead of paying a TCP + TLS handshake each time
+_client = httpx.Client(
+    timeout=30.0,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=60.0),
+)
+atexit.register(_client.close)
 
-def fetch(url: str, max_retries: int = 3) -> str:
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def fetch(url: str, max_retries: int = 3, force_refresh: bool = False) -> str:
     """
     Fetch HTML from a URL with rate limiting and retries.
 
     Args:
         url: The URL to fetch
         max_retries: Maximum number of retry attempts
+        force_refresh: Revalidate a cached page even if it is still fresh
 
     Returns:
         Raw HTML string
@@ -25,26 +46,41 @@ def fetch(url: str, max_retries: int = 3) -> str:
     Raises:
         httpx.HTTPError: If request fails after all retries
     """
-    global _last_request_time
+    headers = {"User-Agent": _user_agent}
 
-    # Enforce rate limiting
-    if _last_request_time is not None:
-        elapsed = time.time() - _last_request_time
-        if elapsed < _min_delay_seconds:
-            time.sleep(_min_delay_seconds - elapsed)
+    # Revalidate a cached copy instead of downloading it again
+    cache_path = _cache_path(url)
+    cached = _read_cache(cache_path) if cache_path else None
+    if cached:
+        # Still fresh per the server's Cache-Control, so skip the request entirely
+        if not force_refresh and cached.get("expires") and cached["expires"] > time.time():
+            return cached["body"]
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
 
-    headers = {"User-Agent": _user_agent}
+    # Enforce rate limiting
+    _wait_for_request_slot()
 
     for attempt in range(max_retries):
         try:
-            _last_request_time = time.time()
+            _mark_request_sent()
 
-            response = httpx.get(url, headers=headers, timeout=30.0, follow_redirects=True)
+            response = _client.get(url, headers=headers)
 
             # Success
             if response.status_code == 200:
+                if cache_path:
+                    _write_cache(cache_path, response)
                 return response.text
 
+            # Unchanged since the cached copy. Refresh its expiry and any new
+            # validators so the next request can skip revalidation again.
+            if response.status_code == 304 and cached:
+                _write_cache(cache_path, response, cached)
+                return cached["body"]
+
             # Rate limited - exponential backoff
             if response.status_code == 429:
                 wait_time = _get_backoff_time(response, attempt)
@@ -82,23 +118,123 @@ def fetch(url: str, max_retries: int = 3) -> str:
     raise httpx.HTTPError(f"Failed to fetch {url} after {max_retries} attempts")
 
 
+def _wait_for_request_slot() -> None:
+    """Sleep until this thread may send its next request.
+
+    Each caller reserves the next free start time under a lock, so requests
+    from concurrent threads stay at least _min_delay_seconds apart while
+    their responses can still be in flight at the same time.
+    """
+    global _last_request_time
+
+    with _rate_limit_lock:
+        now = time.monotonic()
+        if _last_request_time is None:
+            start = now
+        else:
+            start = max(now, _last_request_time + _min_delay_seconds)
+        _last_request_time = start
+
+    if start > now:
+        time.sleep(start - now)
+
+
+def _mark_request_sent() -> None:
+    """Record a request start without moving an already reserved slot back."""
+    global _last_request_time
+
+    with _rate_limit_lock:
+        now = time.monotonic()
+        if _last_request_time is None or now > _last_request_time:
+            _last_request_time = now
+
+
+def _cache_path(url: str) -> str | None:
+    """Return the cache file for a URL, or None if HTTP_CACHE_DIR isn't set."""
+    cache_dir = os.getenv("HTTP_CACHE_DIR")
+    if not cache_dir:
+        return None
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def _read_cache(path: str) -> dict | None:
+    """Load a cached response, ignoring missing or unreadable entries."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: str, response: httpx.Response, revalidated: dict | None = None) -> None:
+    """Store a response body with its validators and freshness, if the server sent any.
+
+    For a 304, pass the cached entry as revalidated: its body is kept, along
+    with any validators the 304 didn't resend.
+    """
+    cache_control = (response.headers.get("Cache-Control") or "").lower()
+    if "no-store" in cache_control:
+        return
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if revalidated:
+        etag = etag or revalidated.get("etag")
+        last_modified = last_modified or revalidated.get("last_modified")
+    expires = _cache_expiry(cache_control)
+    if not etag and not last_modified and expires is None:
+        return
+
+    body = revalidated["body"] if revalidated else response.text
+    entry = {"etag": etag, "last_modified": last_modified, "expires": expires, "body": body}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _cache_expiry(cache_control: str) -> float | None:
+    """Return the wall-clock time a response stops being fresh, or None if it must be revalidated."""
+    if "no-cache" in cache_control:
+        return None
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match or int(match.group(1)) == 0:
+        return None
+    # Wall clock rather than monotonic, since entries outlive the process
+    return time.time() + int(match.group(1))
+
+
 def _get_backoff_time(response: httpx.Response | None, attempt: int) -> float:
-    """Calculate backoff time with optional Retry-After and jitter."""
-    base_wait = (2 ** attempt) * 2
+    """Calculate backoff time with jitter, preferring the server's Retry-After.
+
+    Without Retry-After the wait doubles per attempt. Either way it is
+    capped at _max_backoff_seconds so one response can't stall a run.
+    """
     retry_after = _parse_retry_after(response) if response else None
-    wait_time = max(base_wait, retry_after) if retry_after is not None else base_wait
+    wait_time = retry_after if retry_after is not None else (2 ** attempt) * 2
     jitter = random.uniform(0.0, 1.0)
-    return wait_time + jitter
+    return min(wait_time, _max_backoff_seconds) + jitter
 
 
-def _parse_retry_after(response: httpx.Response | None) -> int | None:
-    """Parse Retry-After header if present (seconds)."""
+def _parse_retry_after(response: httpx.Response | None) -> float | None:
+    """Parse Retry-After header if present, as delay seconds or an HTTP date."""
     if response is None:
         return None
     header = response.headers.get("Retry-After")
     if not header or not isinstance(header, str):
         return None
     try:
-        return int(header)
+        return max(0.0, float(header))
     except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
         return None
+    return max(0.0, retry_at.timestamp() - time.time())
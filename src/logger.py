@@ -2,7 +2,7 @@
 
 import logging
 import sys
-from datetime import datetime
+import time
 from typing import Optional
 
 
@@ -68,12 +68,12 @@ class LogContext:
         self.start_time = None
 
     def __enter__(self):
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter()
         self.logger.info(f"{self.context} - Started")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.now() - self.start_time).total_seconds()
+        duration = time.perf_counter() - self.start_time
 
         if exc_type is None:
             self.logger.info(f"{self.context} - Completed in {duration:.2f}s")
@@ -3,16 +3,19 @@
 CLI entry point for itch-creators scraper.
 """
 import argparse
+import re
 import sys
 from datetime import datetime
-from urllib.parse import urlparse, urlunparse
 
 from . import backfiller, browse_scraper, db, enricher, feed_poller, scorer, seeder
 from .logger import setup_logger, LogContext
-from .models import Creator
+from .models import Creator, Game
 
 logger = setup_logger(__name__)
 
+# Scheme (optional) and non-empty host, with optional port, of a game URL
+_PROFILE_RE = re.compile(r"(https?://)?([^/?#:]+(?::\d+)?)(?:[/?#]|$)")
+
 
 def cmd_poll(args):
     """Poll RSS feeds for new games and creators."""
@@ -21,58 +24,31 @@ def cmd_poll(args):
     entries = feed_poller.get_new_releases()
     logger.info(f"Found {len(entries)} new releases")
 
-    new_creators = 0
-    new_games = 0
-
+    games = []
     for entry in entries:
+        creator_name, game_url, publish_date = entry["creator"], entry["game_url"], entry["publish_date"]
+
         # Skip entries where creator could not be extracted
-        if not entry["creator"]:
-            logger.warning(f"Could not extract creator from URL: {entry['game_url']}")
+        if not creator_name:
+            logger.warning(f"Could not extract creator from URL: {game_url}")
             continue
 
-        # Check if creator exists, if not create them
-        creator = db.get_creator_by_name(entry["creator"])
-
-        if not creator:
-            # Extract profile URL from game URL
-            profile_url = _extract_profile_url(entry["game_url"])
-
-            creator = Creator(
-                id=None,
-                name=entry["creator"],
-                profile_url=profile_url,
-                backfilled=False,
-                first_seen=datetime.now()
-            )
-
-            creator_id = db.insert_creator(creator)
-            if creator_id:
-                new_creators += 1
-                logger.info(f"New creator: {entry['creator']}")
-
-        # Extract game ID from URL
-        game_id = backfiller._extract_game_id(entry["game_url"])
-
-        # Create game object
-        from .models import Game
-        game = Game(
+        games.append(Game(
             id=None,
-            itch_id=game_id,
+            itch_id=backfiller._extract_game_id(game_url),
             title=entry["title"],
-            creator_name=entry["creator"],
-            url=entry["game_url"],
-            publish_date=entry["publish_date"].date() if entry["publish_date"] else None,
+            creator_name=creator_name,
+            url=game_url,
+            publish_date=publish_date.date() if publish_date else None,
             rating=None,
             rating_count=0,
             comment_count=0,
             description=None,
             tags=None,
             scraped_at=None
-        )
+        ))
 
-        inserted_id = db.insert_game(game)
-        if inserted_id:
-            new_games += 1
+    new_creators, new_games = _store_discovered_games(games)
 
     logger.info(f"Results: new_creators={new_creators}, new_games={new_games}")
 
@@ -134,6 +110,50 @@ def cmd_init_db(args):
     logger.info("Database initialized successfully!")
 
 
+def _store_discovered_games(games: list[Game]) -> tuple[int, int]:
+    """
+    Insert discovered games, creating any creators not seen before.
+
+    Creators are looked up and inserted in bulk, then every game goes out
+    as one batch, all in a single transaction.
+
+    Args:
+        games: Games to store, keyed to creators by creator_name
+
+    Returns:
+        Tuple of (new creators, games inserted or updated)
+    """
+    games_by_creator: dict[str, list[Game]] = {}
+    for game in games:
+        games_by_creator.setdefault(game.creator_name, []).append(game)
+
+    if not games_by_creator:
+        return 0, 0
+
+    with db.transaction():
+        creator_ids = db.get_creator_ids(list(games_by_creator))
+
+        new_creators = [
+            Creator(
+                id=None,
+                name=name,
+                profile_url=_extract_profile_url(creator_games[0].url),
+                backfilled=False,
+                first_seen=datetime.now()
+            )
+            for name, creator_games in games_by_creator.items()
+            if name not in creator_ids
+        ]
+        if new_creators:
+            creator_ids.update(db.insert_creators_bulk(new_creators))
+            for creator in new_creators:
+                logger.info(f"New creator: {creator.name}")
+
+        new_games = len(db.insert_games_for_creators(games, creator_ids))
+
+    return len(new_creators), new_games
+
+
 def _extract_profile_url(game_url: str) -> str:
     """
     Extract creator profile URL from game URL.
@@ -147,14 +167,16 @@ def _extract_profile_url(game_url: str) -> str:
 
     Returns:
         Profile URL
-    """
-    # Add scheme if missing
-    if not game_url.startswith(("http://", "https://")):
-        game_url = "https://" + game_url
 
-    parsed = urlparse(game_url)
-    # Reconstruct with just scheme and netloc (domain)
-    return urlunparse((parsed.scheme, parsed.netloc, "", "", "", ""))
+    Raises:
+        ValueError: If the URL has no host
+    """
+    # Keep just the scheme (https if missing) and the domain
+    match = _PROFILE_RE.match(game_url)
+    if not match:
+        raise ValueError(f"Cannot extract profile URL from {game_url!r}")
+    scheme, host = match.groups()
+    return f"{scheme or 'https://'}{host}"
 
 
 def cmd_seed(args):
@@ -171,38 +193,10 @@ def cmd_discover(args):
     with LogContext(logger, "Discovering creators from browse pages"):
         games = browse_scraper.scrape_all_browse_pages(max_pages_per_source=max_pages)
 
-    new_creators = 0
-    new_games = 0
-
-    for game in games:
-        if not game["creator"]:
-            continue
-
-        # Check if creator exists, if not create them
-        creator = db.get_creator_by_name(game["creator"])
-
-        if not creator:
-            profile_url = _extract_profile_url(game["url"])
-
-            creator = Creator(
-                id=None,
-                name=game["creator"],
-                profile_url=profile_url,
-                backfilled=False,
-                first_seen=datetime.now()
-            )
-
-            creator_id = db.insert_creator(creator)
-            if creator_id:
-                new_creators += 1
-
-        # Extract game ID and insert
-        game_id = backfiller._extract_game_id(game["url"])
-
-        from .models import Game
-        game_obj = Game(
+    game_objs = [
+        Game(
             id=None,
-            itch_id=game_id,
+            itch_id=backfiller._extract_game_id(game["url"]),
             title=game["title"],
             creator_name=game["creator"],
             url=game["url"],
@@ -214,10 +208,11 @@ def cmd_discover(args):
             tags=None,
             scraped_at=None
         )
+        for game in games
+        if game["creator"]
+    ]
 
-        inserted_id = db.insert_game(game_obj)
-        if inserted_id:
-            new_games += 1
+    new_creators, new_games = _store_discovered_games(game_objs)
 
     logger.info(f"Results: games_found={len(games)}, new_creators={new_creators}, new_games={new_games}")
 
@@ -232,67 +227,53 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # init-db command
-    subparsers.add_parser("init-db", help="Initialize database schema")
+    subparsers.add_parser("init-db", help="Initialize database schema").set_defaults(func=cmd_init_db)
 
     # poll command
-    subparsers.add_parser("poll", help="Poll RSS feeds for new releases")
+    subparsers.add_parser("poll", help="Poll RSS feeds for new releases").set_defaults(func=cmd_poll)
 
     # backfill command
-    subparsers.add_parser("backfill", help="Backfill creator game histories")
+    subparsers.add_parser("backfill", help="Backfill creator game histories").set_defaults(func=cmd_backfill)
 
     # enrich command
     enrich_parser = subparsers.add_parser("enrich", help="Enrich games with ratings")
     enrich_parser.add_argument("--limit", type=int, default=None, help="Max games to process per run (default: unlimited)")
+    enrich_parser.set_defaults(func=cmd_enrich)
 
     # score command
-    subparsers.add_parser("score", help="Recalculate creator scores")
+    subparsers.add_parser("score", help="Recalculate creator scores").set_defaults(func=cmd_score)
 
     # run command
-    subparsers.add_parser("run", help="Run full pipeline")
+    subparsers.add_parser("run", help="Run full pipeline").set_defaults(func=cmd_run)
 
     # seed command
-    subparsers.add_parser("seed", help="Seed database with known prolific creators")
+    subparsers.add_parser("seed", help="Seed database with known prolific creators").set_defaults(func=cmd_seed)
 
     # discover command
     discover_parser = subparsers.add_parser("discover", help="Discover creators from browse pages")
     discover_parser.add_argument("--pages", type=int, default=2, help="Pages to scrape per source (default: 2)")
+    discover_parser.set_defaults(func=cmd_discover)
 
     # re-enrich command
     re_enrich_parser = subparsers.add_parser("re-enrich", help="Re-enrich stale games to update ratings")
     re_enrich_parser.add_argument("--days", type=int, default=7, help="Re-enrich games older than X days (default: 7)")
     re_enrich_parser.add_argument("--limit", type=int, default=500, help="Max games to process per run (default: 500)")
+    re_enrich_parser.set_defaults(func=cmd_re_enrich)
 
     args = parser.parse_args()
 
-    if not args.command:
+    # Each subcommand sets func; none is set if no command was given
+    if not getattr(args, "func", None):
         parser.print_help()
         sys.exit(1)
 
-    # Execute command
-    commands = {
-        "init-db": cmd_init_db,
-        "poll": cmd_poll,
-        "backfill": cmd_backfill,
-        "enrich": cmd_enrich,
-        "re-enrich": cmd_re_enrich,
-        "score": cmd_score,
-        "run": cmd_run,
-        "seed": cmd_seed,
-        "discover": cmd_discover,
-    }
-
-    command_func = commands.get(args.command)
-    if command_func:
-        try:
-            command_func(args)
-        except KeyboardInterrupt:
-            logger.warning("Interrupted by user")
-            sys.exit(1)
-        except Exception as e:
-            logger.error(f"Error: {e}", exc_info=True)
-            sys.exit(1)
-    else:
-        parser.print_help()
+    try:
+        args.func(args)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error: {e}", exc_info=True)
         sys.exit(1)
 
 
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Game:
     id: int | None
     itch_id: str
@@ -18,7 +18,7 @@ class Game:
     scraped_at: datetime | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Creator:
     id: int | None
     name: str
@@ -27,10 +27,23 @@ class Creator:
     first_seen: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CreatorScore:
     creator_id: int
     game_count: int
     total_ratings: int
     avg_rating: float
     bayesian_score: float
+
+
+@dataclass(slots=True, frozen=True)
+class GameRatingUpdate:
+    game_id: int
+    rating: float | None
+    rating_count: int
+    comment_count: int
+    description: str | None
+    publish_date: datetime | None
+    title: str | None
+    tags: list[str] | None
+    ratings_hidden: bool
@@ -2,7 +2,14 @@ import re
 from datetime import datetime
 from typing import TypedDict
 
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+# Comment counts, e.g. "12 comments" or "Comments (12)", matched against lowercased text
+_COMMENTS_RE = re.compile(r'(\d+)\s*comments?')
+_COMMENTS_PAREN_RE = re.compile(r'comments?\s*\((\d+)\)')
+
+# Elements whose text content is code, not part of the description
+_NON_TEXT_TAGS = frozenset(("script", "style"))
 
 
 class GameRating(TypedDict):
@@ -26,23 +33,29 @@ def parse_game(html: str) -> GameRating:
     Returns:
         Dictionary with title, rating, rating_count, comment_count, description, and publish_date
     """
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
+
+    # Optional sections below are only searched for if their class name
+    # appears in the raw HTML: a substring scan is several times cheaper
+    # than a selector that walks the whole tree and finds nothing.
 
     # Extract title from the page
     title = None
     # Try the main game title element
-    title_elem = soup.find("h1", class_="game_title")
+    title_elem = tree.css_first("h1.game_title")
     if title_elem:
-        title = title_elem.get_text(strip=True)
+        title = title_elem.text(strip=True)
     # Fallback to meta og:title
     if not title:
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = tree.css_first('meta[property="og:title"]')
+        if og_title and og_title.attributes.get("content"):
+            title = og_title.attributes["content"].strip()
 
     # Look for the aggregate rating widget
     # Use itemprop instead of itemtype for more robust matching
-    aggregate_rating = soup.find("div", class_="aggregate_rating", itemprop="aggregateRating")
+    aggregate_rating = None
+    if "aggregate_rating" in html:
+        aggregate_rating = tree.css_first('div.aggregate_rating[itemprop="aggregateRating"]')
 
     rating = None
     rating_count = 0
@@ -50,10 +63,10 @@ def parse_game(html: str) -> GameRating:
     if aggregate_rating:
         # Extract rating value - it's in a div with itemprop="ratingValue"
         # The value is in the "content" attribute, not the text
-        rating_elem = aggregate_rating.find(itemprop="ratingValue")
+        rating_elem = aggregate_rating.css_first('[itemprop="ratingValue"]')
         if rating_elem:
             # Try content attribute first (preferred)
-            content = rating_elem.get("content")
+            content = rating_elem.attributes.get("content")
             if content:
                 try:
                     rating = float(content)
@@ -62,14 +75,14 @@ def parse_game(html: str) -> GameRating:
             else:
                 # Fallback to text content
                 try:
-                    rating = float(rating_elem.get_text(strip=True))
+                    rating = float(rating_elem.text(strip=True))
                 except ValueError:
                     rating = None
 
         # Extract rating count - also uses content attribute
-        rating_count_elem = aggregate_rating.find(itemprop="ratingCount")
+        rating_count_elem = aggregate_rating.css_first('[itemprop="ratingCount"]')
         if rating_count_elem:
-            content = rating_count_elem.get("content")
+            content = rating_count_elem.attributes.get("content")
             if content:
                 try:
                     rating_count = int(content)
@@ -78,7 +91,7 @@ def parse_game(html: str) -> GameRating:
             else:
                 # Fallback to parsing text (e.g., "(49)")
                 try:
-                    text = rating_count_elem.get_text(strip=True)
+                    text = rating_count_elem.text(strip=True)
                     # Remove parentheses and other non-numeric chars
                     rating_count = int(''.join(c for c in text if c.isdigit()))
                 except ValueError:
@@ -90,31 +103,31 @@ def parse_game(html: str) -> GameRating:
     comment_count = 0
 
     # Try finding the comments section header
-    comments_header = soup.find("h2", class_="row_title")
+    comments_header = tree.css_first("h2.row_title") if "row_title" in html else None
     if comments_header:
-        header_text = comments_header.get_text(strip=True).lower()
+        header_text = comments_header.text(strip=True).lower()
         # Look for patterns like "12 comments", "comments (12)", etc.
-        match = re.search(r'(\d+)\s*comments?', header_text)
+        match = _COMMENTS_RE.search(header_text)
         if match:
             comment_count = int(match.group(1))
         else:
             # Check for "comments (12)" format
-            match = re.search(r'comments?\s*\((\d+)\)', header_text)
+            match = _COMMENTS_PAREN_RE.search(header_text)
             if match:
                 comment_count = int(match.group(1))
 
     # Alternative: look for community widget comment count
-    if comment_count == 0:
-        community_widget = soup.find("div", class_="community_widget")
+    if comment_count == 0 and "community_widget" in html:
+        community_widget = tree.css_first("div.community_widget")
         if community_widget:
-            community_text = community_widget.get_text()
-            match = re.search(r'(\d+)\s*comments?', community_text.lower())
+            community_text = community_widget.text()
+            match = _COMMENTS_RE.search(community_text.lower())
             if match:
                 comment_count = int(match.group(1))
 
     # Alternative: count actual comment divs if they're loaded
-    if comment_count == 0:
-        comments = soup.find_all("div", class_="community_post")
+    if comment_count == 0 and "community_post" in html:
+        comments = tree.css("div.community_post")
         if comments:
             comment_count = len(comments)
 
@@ -124,16 +137,25 @@ def parse_game(html: str) -> GameRating:
 
     # Try to find the game description/summary
     # Look for meta description first (short summary)
-    meta_description = soup.find("meta", attrs={"name": "description"})
-    if meta_description and meta_description.get("content"):
-        description = meta_description.get("content").strip()
+    meta_description = tree.css_first('meta[name="description"]')
+    if meta_description and meta_description.attributes.get("content"):
+        description = meta_description.attributes["content"].strip()
 
     # If no meta description, try to find the formatted description on the page
-    if not description:
-        desc_div = soup.find("div", class_="formatted_description")
+    if not description and "formatted_description" in html:
+        desc_div = tree.css_first("div.formatted_description")
         if desc_div:
-            # Get just the text, limit to first paragraph or first ~200 chars for summary
-            desc_text = desc_div.get_text(separator=" ", strip=True)
+            # Get just the text, limit to first paragraph or first ~200 chars for summary.
+            # Join non-blank text nodes by hand: text(separator=...) keeps the blank ones.
+            # Skip the contents of inline scripts and styles, which aren't visible text.
+            desc_text = " ".join(
+                text for text in (
+                    node.text_content.strip()
+                    for node in desc_div.traverse(include_text=True)
+                    if node.tag == "-text" and node.parent.tag not in _NON_TEXT_TAGS
+                )
+                if text
+            )
             if desc_text:
                 # Limit to first 500 characters as a summary
                 description = desc_text[:500].strip()
@@ -145,16 +167,18 @@ def parse_game(html: str) -> GameRating:
     publish_date = None
 
     # Try finding date in the info panel (e.g., "Published Dec 25, 2024")
-    info_panel = soup.find("div", class_="info_panel_wrapper")
+    info_panel = tree.css_first("div.info_panel_wrapper") if "info_panel_wrapper" in html else None
     if info_panel:
         # Look for "Published" or "Released" text
-        for td in info_panel.find_all("td"):
-            text = td.get_text(strip=True).lower()
+        for td in info_panel.css("td"):
+            text = td.text(strip=True).lower()
             if "published" in text or "released" in text:
                 # Get the next sibling or value cell
-                value_td = td.find_next_sibling("td")
+                value_td = td.next
+                while value_td is not None and value_td.tag != "td":
+                    value_td = value_td.next
                 if value_td:
-                    date_str = value_td.get_text(strip=True)
+                    date_str = value_td.text(strip=True)
                     # Try parsing common date formats
                     for fmt in ["%b %d, %Y", "%B %d, %Y", "%Y-%m-%d", "%d %b %Y"]:
                         try:
@@ -164,12 +188,12 @@ def parse_game(html: str) -> GameRating:
                             continue
 
     # Alternative: look for abbr with title attribute containing ISO date
-    if not publish_date:
-        date_abbr = soup.find("abbr", class_="date_format")
-        if date_abbr and date_abbr.get("title"):
+    if not publish_date and "date_format" in html:
+        date_abbr = tree.css_first("abbr.date_format[title]")
+        if date_abbr and date_abbr.attributes.get("title"):
             try:
                 # ISO format: 2024-12-25T12:00:00Z
-                date_str = date_abbr["title"]
+                date_str = date_abbr.attributes["title"]
                 publish_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
             except (ValueError, TypeError):
                 pass
@@ -180,8 +204,9 @@ def parse_game(html: str) -> GameRating:
     seen_tags: set[str] = set()
 
     # Find all tag/genre links
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
+    has_tag_links = "/games/genre-" in html or "/games/tag-" in html
+    for link in tree.css("a[href]") if has_tag_links else ():
+        href = link.attributes.get("href") or ""
         # Match genre-* or tag-* patterns
         if "/games/genre-" in href or "/games/tag-" in href:
             # Extract the tag name from URL
@@ -1,7 +1,17 @@
+import re
 from datetime import datetime
 from typing import TypedDict
 
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+# "Jan 15, 2024" or "January 15, 2024", as accepted by "%b %d, %Y" / "%B %d, %Y"
+_DATE_RE = re.compile(r"([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})")
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
 
 
 class ProfileGame(TypedDict):
@@ -21,23 +31,23 @@ def parse_profile(html: str) -> tuple[list[ProfileGame], str | None]:
     Returns:
         Tuple of (games list, next page URL or None)
     """
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
     games: list[ProfileGame] = []
 
     # Find all game cells
-    game_cells = soup.find_all("div", class_="game_cell")
+    game_cells = tree.css("div.game_cell")
 
     for cell in game_cells:
         # Extract title and URL - specifically look for the title link, not the thumbnail link
         # The title link has class "title game_link", thumbnail has "thumb_link game_link"
-        title_link = cell.find("a", class_="title")
-        title = title_link.get_text(strip=True) if title_link else ""
+        title_link = cell.css_first("a.title")
+        title = title_link.text(strip=True) if title_link else ""
 
         # If no title found, try fallback methods
         if not title:
             # Fallback: try finding any game_link with text content
-            for link in cell.find_all("a", class_="game_link"):
-                text = link.get_text(strip=True)
+            for link in cell.css("a.game_link"):
+                text = link.text(strip=True)
                 if text:
                     title_link = link
                     title = text
@@ -47,13 +57,13 @@ def parse_profile(html: str) -> tuple[list[ProfileGame], str | None]:
         if not title or not title_link:
             continue
 
-        url = title_link.get("href", "")
+        url = title_link.attributes.get("href") or ""
 
         # Extract publish date if available
         publish_date = None
-        published_at = cell.find("div", class_="published_at")
+        published_at = cell.css_first("div.published_at")
         if published_at:
-            date_text = published_at.get_text(strip=True)
+            date_text = published_at.text(strip=True)
             publish_date = _parse_date_text(date_text)
 
         games.append({
@@ -64,9 +74,9 @@ def parse_profile(html: str) -> tuple[list[ProfileGame], str | None]:
 
     # Check for pagination - look for "next" link
     next_url = None
-    next_link = soup.find("a", class_="next_page")
+    next_link = tree.css_first("a.next_page")
     if next_link:
-        next_url = next_link.get("href")
+        next_url = next_link.attributes.get("href")
 
     return games, next_url
 
@@ -88,16 +98,17 @@ def _parse_date_text(text: str) -> datetime | None:
     # Remove "Published" prefix
     text = text.replace("Published", "").strip()
 
-    try:
-        # Try parsing "Jan 15, 2024" format
-        return datetime.strptime(text, "%b %d, %Y")
-    except ValueError:
-        pass
+    # One match and a month lookup instead of trying strptime per format
+    match = _DATE_RE.fullmatch(text)
+    if not match:
+        return None
+
+    month = _MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
 
     try:
-        # Try alternative format "January 15, 2024"
-        return datetime.strptime(text, "%B %d, %Y")
+        return datetime(int(match.group(3)), month, int(match.group(2)))
     except ValueError:
-        pass
-
-    return None
+        # Day out of range for the month
+        return None
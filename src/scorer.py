@@ -101,42 +101,18 @@ def score_creator(creator_id: int) -> CreatorScore:
         row = cursor.fetchone()
         cursor.close()
 
-        if not row or row[0] == 0:
-            # No games
-            return CreatorScore(
-                creator_id=creator_id,
-                game_count=0,
-                total_ratings=0,
-                avg_rating=0.0,
-                bayesian_score=0.0
-            )
-
-        total_games = row[0] or 0
-        total_ratings = row[1] or 0
-        weighted_rating_sum = float(row[2]) if row[2] else 0.0
-
-        # Compute weighted average: sum of (rating * count) / total count
-        if total_ratings > 0:
-            avg_rating = weighted_rating_sum / total_ratings
-        else:
-            avg_rating = _GLOBAL_AVG
-
-        # Calculate Love Score
-        love_score = calculate_love_score(avg_rating, total_ratings, total_games)
-
-        return CreatorScore(
-            creator_id=creator_id,
-            game_count=total_games,
-            total_ratings=total_ratings,
-            avg_rating=round(avg_rating, 2),
-            bayesian_score=love_score  # Using bayesian_score field for Love Score
-        )
+    if not row:
+        return _score_from_stats(creator_id, 0, 0, None)
+    return _score_from_stats(creator_id, *row)
 
 
 def score_all() -> dict[str, int]:
     """
     Recalculate scores for all creators.
 
+    Every creator's game stats come from one aggregate query and all
+    scores are written back with one bulk upsert, in a single transaction.
+
     Returns:
         Dictionary with stats: {creators_scored}
     """
@@ -144,18 +120,65 @@ def score_all() -> dict[str, int]:
         "creators_scored": 0,
     }
 
-    with db.get_connection() as conn:
+    with db.transaction() as conn:
         cursor = conn.cursor()
 
-        # Get all creator IDs
-        cursor.execute("SELECT id FROM creators")
-        creator_ids = [row[0] for row in cursor.fetchall()]
+        # Same aggregates as score_creator, for every creator at once.
+        # Creators without games get a row of zeros from the LEFT JOIN.
+        cursor.execute("""
+            SELECT
+                c.id,
+                COUNT(g.id) as total_games,
+                SUM(CASE WHEN g.rating IS NOT NULL THEN g.rating_count ELSE 0 END) as total_ratings,
+                SUM(CASE WHEN g.rating IS NOT NULL THEN g.rating * g.rating_count ELSE 0 END) as weighted_rating_sum
+            FROM creators c
+            LEFT JOIN games g ON g.creator_id = c.id
+            GROUP BY c.id
+        """)
+        rows = cursor.fetchall()
         cursor.close()
 
-    # Score each creator
-    for creator_id in creator_ids:
-        score = score_creator(creator_id)
-        db.upsert_creator_score(score)
-        stats["creators_scored"] += 1
+        scores = [_score_from_stats(*row) for row in rows]
+        db.upsert_creator_scores_bulk(scores)
+
+    stats["creators_scored"] = len(scores)
 
     return stats
+
+
+def _score_from_stats(
+    creator_id: int,
+    total_games: int | None,
+    total_ratings: int | None,
+    weighted_rating_sum
+) -> CreatorScore:
+    """Build a creator's score from their aggregated game stats."""
+    if not total_games:
+        # No games
+        return CreatorScore(
+            creator_id=creator_id,
+            game_count=0,
+            total_ratings=0,
+            avg_rating=0.0,
+            bayesian_score=0.0
+        )
+
+    total_ratings = total_ratings or 0
+    weighted_rating_sum = float(weighted_rating_sum) if weighted_rating_sum else 0.0
+
+    # Compute weighted average: sum of (rating * count) / total count
+    if total_ratings > 0:
+        avg_rating = weighted_rating_sum / total_ratings
+    else:
+        avg_rating = _GLOBAL_AVG
+
+    # Calculate Love Score
+    love_score = calculate_love_score(avg_rating, total_ratings, total_games)
+
+    return CreatorScore(
+        creator_id=creator_id,
+        game_count=total_games,
+        total_ratings=total_ratings,
+        avg_rating=round(avg_rating, 2),
+        bayesian_score=love_score  # Using bayesian_score field for Love Score
+    )
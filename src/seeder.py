@@ -76,22 +76,27 @@ def seed_creators() -> dict[str, int]:
     """
     stats = {"added": 0, "skipped": 0}
 
+    existing = set(db.get_creator_ids([name for name, _ in KNOWN_CREATORS]))
+    new_creators: list[Creator] = []
+
     for name, profile_url in KNOWN_CREATORS:
-        existing = db.get_creator_by_name(name)
-        if existing:
+        if name in existing:
             stats["skipped"] += 1
             continue
 
-        creator = Creator(
+        existing.add(name)
+        new_creators.append(Creator(
             id=None,
             name=name,
             profile_url=profile_url,
             backfilled=False,
             first_seen=datetime.now(),
-        )
-        db.insert_creator(creator)
+        ))
+
+    db.insert_creators_bulk(new_creators)
+    for creator in new_creators:
         stats["added"] += 1
-        print(f"Added creator: {name}")
+        print(f"Added creator: {creator.name}")
 
     return stats
 
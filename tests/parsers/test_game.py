@@ -166,3 +166,22 @@ def test_parse_game_without_itemtype():
     result = parse_game(html_no_itemtype)
     assert result["rating"] == 3.8
     assert result["rating_count"] == 42
+
+
+def test_parse_game_description_skips_inline_script_and_style():
+    """Test that script and style contents inside the description aren't treated as text."""
+    html_with_script = """
+    <html>
+    <body>
+        <div class="formatted_description">
+            <p>Explore a haunted lighthouse.</p>
+            <script>var tracking = {"id": 123};</script>
+            <style>.promo { color: red; }</style>
+            <p>Solve its puzzles.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+    result = parse_game(html_with_script)
+    assert result["description"] == "Explore a haunted lighthouse. Solve its puzzles."
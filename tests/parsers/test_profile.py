@@ -117,6 +117,9 @@ def test_parse_date_text_invalid():
     assert _parse_date_text("Invalid date") is None
     assert _parse_date_text("2024-01-15") is None
     assert _parse_date_text("") is None
+    # Unknown month name, and a day that doesn't exist in the month
+    assert _parse_date_text("Sept 1, 2024") is None
+    assert _parse_date_text("Feb 30, 2024") is None
 
 
 def test_parse_profile_extracts_all_grids(sample_profile_html):
@@ -128,3 +131,18 @@ def test_parse_profile_extracts_all_grids(sample_profile_html):
     titles = [game["title"] for game in games]
     assert "Cool Adventure Game" in titles
     assert "Old Game" in titles
+
+
+def test_parse_profile_next_page():
+    """Test that the pagination link survives partial parsing."""
+    html = """
+    <html><body>
+        <div class="game_cell has_cover">
+            <a class="title game_link" href="https://dev.itch.io/game">Game</a>
+        </div>
+        <a class="next_page button" href="?page=2">Next page</a>
+    </body></html>
+    """
+    games, next_url = parse_profile(html)
+    assert len(games) == 1
+    assert next_url == "?page=2"
@@ -8,6 +8,13 @@ from src.backfiller import _extract_game_id, backfill_all, backfill_creator
 from src.models import Creator
 
 
+@pytest.fixture(autouse=True)
+def mock_transaction():
+    """Stub out the database transaction wrapping backfill writes."""
+    with patch("src.backfiller.db.transaction") as mock_txn:
+        yield mock_txn
+
+
 @pytest.fixture
 def sample_creator():
     """Create a sample creator for testing."""
@@ -30,29 +37,33 @@ def sample_profile_html():
 def test_backfill_creator(sample_creator, sample_profile_html):
     """Test backfilling a single creator."""
     with patch("src.backfiller.fetch") as mock_fetch, \
-         patch("src.backfiller.db.insert_game") as mock_insert_game, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
          patch("src.backfiller.db.mark_creator_backfilled") as mock_mark_backfilled:
 
         mock_fetch.return_value = sample_profile_html
-        mock_insert_game.return_value = 1  # Return a valid ID
+        mock_insert_games.return_value = [1, 2, 3, 4]
 
         result = backfill_creator(sample_creator)
 
         # Should have fetched the profile
         mock_fetch.assert_called_once_with("https://testdev.itch.io")
 
-        # Should have inserted 4 games (from fixture)
-        assert mock_insert_game.call_count == 4
+        # Should have inserted 4 games (from fixture) in a single batch
+        mock_insert_games.assert_called_once()
+        games, creator_id = mock_insert_games.call_args[0]
+        assert len(games) == 4
+        assert creator_id == 1
         assert result == 4
 
-        # Should have marked creator as backfilled
-        mock_mark_backfilled.assert_called_once_with(1)
+        # Backfilled flag is set by the same statement as the insert
+        assert mock_insert_games.call_args[1]["mark_backfilled"] is True
+        mock_mark_backfilled.assert_not_called()
 
 
 def test_backfill_creator_empty_profile(sample_creator):
     """Test backfilling a creator with no games."""
     with patch("src.backfiller.fetch") as mock_fetch, \
-         patch("src.backfiller.db.insert_game") as mock_insert_game, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
          patch("src.backfiller.db.mark_creator_backfilled") as mock_mark_backfilled:
 
         mock_fetch.return_value = "<html><body></body></html>"
@@ -61,12 +72,87 @@ def test_backfill_creator_empty_profile(sample_creator):
 
         # No games inserted
         assert result == 0
-        mock_insert_game.assert_not_called()
+        mock_insert_games.assert_not_called()
 
         # Still marked as backfilled
         mock_mark_backfilled.assert_called_once_with(1)
 
 
+def test_backfill_creator_skips_duplicate_games(sample_creator):
+    """Test that a game listed on several profile pages is only sent once."""
+    page1 = [
+        {"title": "Game A", "url": "/game-a", "publish_date": None},
+        {"title": "Game B", "url": "/game-b", "publish_date": None},
+    ]
+    page2 = [
+        {"title": "Game B", "url": "/game-b", "publish_date": None},
+        {"title": "Game C", "url": "/game-c", "publish_date": None},
+    ]
+
+    with patch("src.backfiller.fetch") as mock_fetch, \
+         patch("src.backfiller.profile.parse_profile") as mock_parse, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
+         patch("src.backfiller.db.mark_creator_backfilled"):
+
+        mock_fetch.return_value = "<html></html>"
+        mock_parse.side_effect = [(page1, "?page=2"), (page2, None)]
+        mock_insert_games.return_value = [1, 2, 3]
+
+        backfill_creator(sample_creator)
+
+        games = mock_insert_games.call_args[0][0]
+        assert [game.itch_id for game in games] == ["game-a", "game-b", "game-c"]
+
+
+def test_backfill_creator_keeps_earlier_pages_on_error(sample_creator):
+    """Test that a fetch error on a later page still saves the pages before it."""
+    page1 = [
+        {"title": "Game A", "url": "/game-a", "publish_date": None},
+        {"title": "Game B", "url": "/game-b", "publish_date": None},
+    ]
+
+    with patch("src.backfiller.fetch") as mock_fetch, \
+         patch("src.backfiller.profile.parse_profile") as mock_parse, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
+         patch("src.backfiller.db.mark_creator_backfilled") as mock_mark_backfilled:
+
+        mock_fetch.side_effect = ["<html></html>", Exception("Network error")]
+        mock_parse.return_value = (page1, "?page=2")
+
+        with pytest.raises(Exception, match="Network error"):
+            backfill_creator(sample_creator)
+
+        mock_insert_games.assert_called_once()
+        games, creator_id = mock_insert_games.call_args[0]
+        assert [game.itch_id for game in games] == ["game-a", "game-b"]
+        assert creator_id == 1
+
+        # Not marked backfilled, so the profile is retried
+        assert not mock_insert_games.call_args[1].get("mark_backfilled", False)
+        mock_mark_backfilled.assert_not_called()
+
+
+def test_backfill_creator_reraises_fetch_error_when_partial_insert_fails(sample_creator):
+    """Test that a failed partial insert doesn't replace the original fetch error."""
+    page1 = [{"title": "Game A", "url": "/game-a", "publish_date": None}]
+
+    with patch("src.backfiller.fetch") as mock_fetch, \
+         patch("src.backfiller.profile.parse_profile") as mock_parse, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
+         patch("src.backfiller.log_error_with_context") as mock_log_error:
+
+        mock_fetch.side_effect = ["<html></html>", Exception("Network error")]
+        mock_parse.return_value = (page1, "?page=2")
+        mock_insert_games.side_effect = Exception("connection lost")
+
+        with pytest.raises(Exception, match="Network error"):
+            backfill_creator(sample_creator)
+
+        mock_insert_games.assert_called_once()
+        mock_log_error.assert_called_once()
+        assert "connection lost" in str(mock_log_error.call_args[0][3])
+
+
 def test_backfill_all():
     """Test backfilling all unbackfilled creators."""
     creator1 = Creator(1, "dev1", "https://dev1.itch.io", False, datetime(2024, 1, 1))
@@ -137,21 +223,27 @@ def test_extract_game_id():
     # With both query params and trailing slash
     assert _extract_game_id("https://testdev.itch.io/another-game/?key=value") == "another-game"
 
+    # Slashes inside the query string don't affect the slug
+    assert _extract_game_id("https://testdev.itch.io/cool-game?next=/a/b") == "cool-game"
+
+    # Unparseable URLs fall back to a stable hash
+    assert _extract_game_id("/").startswith("unknown-")
+    assert _extract_game_id("/") == _extract_game_id("/")
+
 
 def test_backfill_creator_inserts_correct_game_data(sample_creator, sample_profile_html):
     """Test that game data is correctly formatted for insertion."""
     with patch("src.backfiller.fetch") as mock_fetch, \
-         patch("src.backfiller.db.insert_game") as mock_insert_game, \
+         patch("src.backfiller.db.insert_games_bulk") as mock_insert_games, \
          patch("src.backfiller.db.mark_creator_backfilled"):
 
         mock_fetch.return_value = sample_profile_html
-        mock_insert_game.return_value = 1
+        mock_insert_games.return_value = [1, 2, 3, 4]
 
         backfill_creator(sample_creator)
 
         # Check the first game inserted
-        first_call = mock_insert_game.call_args_list[0]
-        game = first_call[0][0]
+        game = mock_insert_games.call_args[0][0][0]
 
         assert game.creator_name == "testdev"
         assert game.title == "Cool Adventure Game"
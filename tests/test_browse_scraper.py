@@ -0,0 +1,105 @@
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.browse_scraper import _extract_creator_from_url, scrape_all_browse_pages, scrape_browse_page
+
+
+@pytest.fixture
+def sample_browse_html():
+    """Load sample browse page fixture."""
+    fixture_path = Path(__file__).parent / "fixtures" / "browse_sample.html"
+    return fixture_path.read_text()
+
+
+def test_scrape_browse_page(sample_browse_html):
+    """Test extracting games from a browse page."""
+    with patch("src.browse_scraper.fetch") as mock_fetch:
+        mock_fetch.return_value = sample_browse_html
+
+        result = scrape_browse_page("https://itch.io/games/top-rated", max_pages=1)
+
+        # Non-creator URLs are skipped and each game is listed once
+        assert len(result) == 2
+
+        # Thumbnail link has no text, so the title comes from the game_cell
+        assert result[0] == {
+            "title": "Cool Adventure Game",
+            "url": "https://testdev.itch.io/cool-adventure",
+            "creator": "testdev",
+        }
+
+        # No title anywhere in the cell falls back to the URL slug
+        assert result[1]["title"] == "puzzle-master"
+        assert result[1]["creator"] == "puzzleguru"
+
+
+def test_scrape_browse_page_follows_next_page(sample_browse_html):
+    """Test that pagination follows the next_page link."""
+    with patch("src.browse_scraper.fetch") as mock_fetch:
+        mock_fetch.side_effect = [sample_browse_html, "<html><body></body></html>"]
+
+        result = scrape_browse_page("https://itch.io/games/top-rated", max_pages=3)
+
+        assert len(result) == 2
+        assert mock_fetch.call_count == 2
+        mock_fetch.assert_called_with("https://itch.io/games/top-rated?page=2")
+
+
+def test_scrape_browse_page_stops_on_empty_page():
+    """Test that a page without game cells ends pagination without parsing."""
+    with patch("src.browse_scraper.fetch") as mock_fetch, \
+         patch("src.browse_scraper.LexborHTMLParser") as mock_parser:
+        mock_fetch.return_value = "<html><body><p>No results</p></body></html>"
+
+        result = scrape_browse_page("https://itch.io/games/top-rated", max_pages=3)
+
+        assert result == []
+        mock_fetch.assert_called_once()
+        mock_parser.assert_not_called()
+
+
+def test_scrape_all_browse_pages_deduplicates():
+    """Test that duplicates are credited to the earliest source, whichever finishes first."""
+    sources = (
+        ("first", "https://itch.io/games/first"),
+        ("second", "https://itch.io/games/second"),
+        ("broken", "https://itch.io/games/broken"),
+    )
+    shared = {"title": "Shared", "url": "https://dev.itch.io/shared", "creator": "dev"}
+    first_started = threading.Event()
+    second_done = threading.Event()
+
+    def fake_scrape(url, max_pages):
+        if url.endswith("broken"):
+            raise RuntimeError("boom")
+        if url.endswith("first"):
+            # Finish after the second source so thread timing can't decide credit
+            first_started.set()
+            second_done.wait(timeout=5)
+        else:
+            first_started.wait(timeout=5)
+            second_done.set()
+        return [{"title": url, "url": url, "creator": "dev"}, shared]
+
+    with patch("src.browse_scraper.BROWSE_PAGES", sources), \
+         patch("src.browse_scraper.scrape_browse_page", side_effect=fake_scrape):
+
+        result = scrape_all_browse_pages(max_pages_per_source=1)
+
+        # Results are kept in source order and the failing source is skipped
+        assert [game["url"] for game in result] == [sources[0][1], shared["url"], sources[1][1]]
+
+
+def test_extract_creator_from_url():
+    """Test extracting creator username from game URLs."""
+    assert _extract_creator_from_url("https://testdev.itch.io/cool-game") == "testdev"
+    assert _extract_creator_from_url("https://itch.io/jam/some-jam") is None
+    assert _extract_creator_from_url("https://www.itch.io/games") is None
+    assert _extract_creator_from_url("https://static.itch.io/cover.png") is None
+
+    # Without protocol, or with nothing after the domain
+    assert _extract_creator_from_url("testdev.itch.io/cool-game") == "testdev"
+    assert _extract_creator_from_url("https://testdev.itch.io") == "testdev"
@@ -1,21 +1,31 @@
 import os
+from dataclasses import replace
 from datetime import datetime, date
 from unittest.mock import MagicMock, patch
 
 import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 from src.db import (
+    _POOL_MIN_CONN,
     create_tables,
     get_creator_by_name,
+    get_creator_ids,
     get_unbackfilled_creators,
     get_unenriched_games,
     insert_creator,
+    insert_creators_bulk,
     insert_game,
+    insert_games_bulk,
+    insert_games_for_creators,
     mark_creator_backfilled,
+    transaction,
     update_game_ratings,
+    update_game_ratings_bulk,
     upsert_creator_score,
+    upsert_creator_scores_bulk,
 )
-from src.models import Creator, CreatorScore, Game
+from src.models import Creator, CreatorScore, Game, GameRatingUpdate
 
 
 @pytest.fixture
@@ -27,6 +37,38 @@ def mock_env(monkeypatch):
     monkeypatch.setenv("POSTGRES_HOST", "localhost")
 
 
+@pytest.fixture(autouse=True)
+def reset_db_state(monkeypatch):
+    """Give each test a fresh connection pool and creator cache so mocks don't leak."""
+    import src.db
+    monkeypatch.setattr(src.db, "_pool", None)
+    monkeypatch.setattr(src.db, "_creator_id_cache", {})
+    yield
+
+
+@pytest.fixture
+def prepared_statements(monkeypatch):
+    """Turn on server-side prepared statements, which are off by default."""
+    import src.db
+    monkeypatch.setattr(src.db, "_USE_PREPARED_STATEMENTS", True)
+
+
+@pytest.fixture
+def mock_db():
+    """Bind a mock connection as the active connection, bypassing the pool.
+
+    Yields (mock_conn, mock_cursor). Use patch("src.db.psycopg2.connect")
+    instead for tests that check pooling, commit or rollback behavior.
+    """
+    import src.db
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    token = src.db._active_conn.set(mock_conn)
+    yield mock_conn, mock_cursor
+    src.db._active_conn.reset(token)
+
+
 def test_create_tables(mock_env):
     """Test that create_tables executes SQL without errors."""
     with patch("src.db.psycopg2.connect") as mock_connect:
@@ -34,16 +76,130 @@ def test_create_tables(mock_env):
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
+        # Schema check says "not current"
+        mock_cursor.fetchone.return_value = (False,)
 
         create_tables()
 
         # Verify connection was established
-        mock_connect.assert_called_once()
-        # Verify SQL was executed multiple times for schema setup
-        # 3 CREATE TABLE + 5 ALTER TABLE + 2 constraint checks + 2 CREATE INDEX = 12 minimum
-        assert mock_cursor.execute.call_count >= 12
+        assert mock_connect.called
+        # Schema check, then the whole schema as one script
+        assert mock_cursor.execute.call_count == 2
+        queries = mock_cursor.execute.call_args[0][0]
+        assert "CREATE TABLE IF NOT EXISTS creator_scores" in queries
+        assert "games_creator_id_itch_id_key" in queries
+        assert "idx_games_unenriched" in queries
+        assert "idx_creators_unbackfilled" in queries
         mock_conn.commit.assert_called_once()
-        mock_conn.close.assert_called_once()
+        # Connection goes back to the pool instead of being closed
+        mock_conn.close.assert_not_called()
+
+
+def test_create_tables_skips_ddl_when_schema_is_current(mock_db):
+    """Test that create_tables only runs the schema check on an up-to-date database."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchone.return_value = (True,)
+
+    create_tables()
+
+    mock_cursor.execute.assert_called_once()
+    assert "pg_indexes" in mock_cursor.execute.call_args[0][0]
+
+
+def test_schema_index_list_matches_create_tables():
+    """Test that the fast-path index list covers every index create_tables builds."""
+    import re
+
+    import src.db
+
+    created = re.findall(r"CREATE INDEX IF NOT EXISTS (\w+)", src.db._SCHEMA_SQL)
+    assert sorted(created) == sorted(src.db._SCHEMA_INDEXES)
+
+
+def test_connection_pool_reuses_connection(mock_env):
+    """Test that consecutive calls borrow the same pooled connection."""
+    with patch("src.db.psycopg2.connect") as mock_connect:
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+        mark_creator_backfilled(1)
+        mark_creator_backfilled(2)
+
+        # Only the pool's initial connections are opened
+        assert mock_connect.call_count == _POOL_MIN_CONN
+        assert mock_conn.commit.call_count == 2
+
+
+def test_transaction_shares_one_connection_and_commit(mock_env):
+    """Test that db calls inside transaction() reuse its connection and commit once."""
+    with patch("src.db.psycopg2.connect") as mock_connect:
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+
+        with transaction() as conn:
+            mark_creator_backfilled(1)
+            mark_creator_backfilled(2)
+            assert conn is mock_conn
+            mock_conn.commit.assert_not_called()
+
+        mock_conn.commit.assert_called_once()
+        assert mock_cursor.execute.call_count == 2
+
+
+def test_transaction_rolls_back_everything_on_error(mock_env):
+    """Test that an error inside transaction() rolls back all writes."""
+    with patch("src.db.psycopg2.connect") as mock_connect:
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+
+        with pytest.raises(RuntimeError):
+            with transaction():
+                mark_creator_backfilled(1)
+                raise RuntimeError("boom")
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+
+def test_connection_pool_size_from_env(mock_env, monkeypatch):
+    """Test that pool bounds can be overridden from the environment."""
+    monkeypatch.setenv("POSTGRES_POOL_MIN", "1")
+    monkeypatch.setenv("POSTGRES_POOL_MAX", "4")
+
+    with patch("src.db.ThreadedConnectionPool") as mock_pool_cls:
+        from src.db import _get_pool
+        _get_pool()
+
+        assert mock_pool_cls.call_args[0][:2] == (1, 4)
+
+
+def test_get_connection_rolls_back_on_error(mock_env):
+    """Test that a failed query rolls back and returns the connection."""
+    with patch("src.db.psycopg2.connect") as mock_connect:
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        mock_cursor.execute.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            mark_creator_backfilled(1)
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+        # Connection is still usable from the pool afterwards
+        mock_cursor.execute.side_effect = None
+        mark_creator_backfilled(1)
+        assert mock_connect.call_count == _POOL_MIN_CONN
 
 
 def test_insert_creator(mock_env):
@@ -70,6 +226,61 @@ def test_insert_creator(mock_env):
         mock_conn.commit.assert_called_once()
 
 
+def test_insert_creator_existing(mock_db):
+    """Test that an existing creator's ID comes back from the same statement."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchone.return_value = (42,)
+
+    creator = Creator(None, "testdev", "https://testdev.itch.io", False, datetime(2024, 1, 1))
+
+    assert insert_creator(creator) == 42
+    mock_cursor.execute.assert_called_once()
+    query = mock_cursor.execute.call_args[0][0]
+    # A no-op update, so a row committed concurrently is still returned
+    assert "ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name" in query
+    assert "RETURNING id" in query
+
+
+def test_insert_creators_bulk(mock_db):
+    """Test that new and existing creators' IDs come back from one statement."""
+    import src.db
+    _, mock_cursor = mock_db
+
+    with patch("src.db.execute_values") as mock_execute_values:
+        mock_execute_values.return_value = [(8, "newdev"), (7, "olddev")]
+        creators = [
+            Creator(None, "newdev", "https://newdev.itch.io", False, datetime(2024, 1, 1)),
+            Creator(None, "olddev", "https://olddev.itch.io", False, datetime(2024, 1, 1)),
+            Creator(None, "newdev", "https://newdev.itch.io", False, datetime(2024, 1, 1)),
+        ]
+
+        result = insert_creators_bulk(creators)
+
+        assert result == {"newdev": 8, "olddev": 7}
+        query, rows = mock_execute_values.call_args[0][1:3]
+        assert "ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name" in query
+        assert "RETURNING id, name" in query
+        # Deduplicated, since DO UPDATE can't touch the same row twice
+        assert [row[0] for row in rows] == ["newdev", "olddev"]
+        assert mock_execute_values.call_args[1]["fetch"] is True
+
+        # No follow-up lookup for the creator that already existed
+        mock_cursor.execute.assert_not_called()
+        assert src.db._creator_id_cache == {"newdev": 8, "olddev": 7}
+
+
+def test_get_creator_ids(mock_db):
+    """Test looking up several creators in one query."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = [(1, "dev1"), (2, "dev2")]
+
+    result = get_creator_ids(["dev1", "dev2", "missing"])
+
+    assert result == {"dev1": 1, "dev2": 2}
+    mock_cursor.execute.assert_called_once()
+    assert "ANY(%s)" in mock_cursor.execute.call_args[0][0]
+
+
 def test_insert_game(mock_env):
     """Test inserting a new game."""
     with patch("src.db.psycopg2.connect") as mock_connect:
@@ -78,8 +289,7 @@ def test_insert_game(mock_env):
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        # First call returns creator_id, second returns game id
-        mock_cursor.fetchone.side_effect = [(1,), (456,)]
+        mock_cursor.fetchone.return_value = (456,)
 
         game = Game(
             id=None,
@@ -99,10 +309,46 @@ def test_insert_game(mock_env):
         result = insert_game(game)
 
         assert result == 456
-        assert mock_cursor.execute.call_count == 2  # creator lookup + insert
+        # Creator lookup and upsert happen in a single statement
+        mock_cursor.execute.assert_called_once()
+        query, params = mock_cursor.execute.call_args[0]
+        assert "FROM creators c" in query
+        assert params[-1] == "testdev"
         mock_conn.commit.assert_called_once()
 
 
+def test_insert_game_uses_cached_creator_id(mock_db):
+    """Test that a creator seen by insert_creator skips the lookup in insert_game."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchone.side_effect = [(123,), (456,)]
+
+    insert_creator(Creator(
+        id=None,
+        name="testdev",
+        profile_url="https://testdev.itch.io",
+        backfilled=False,
+        first_seen=datetime.now()
+    ))
+    result = insert_game(_make_game("cached-game"))
+
+    assert result == 456
+    query, params = mock_cursor.execute.call_args[0]
+    assert "FROM creators" not in query
+    assert params[2] == 123  # creator_id
+
+
+def test_insert_game_with_explicit_creator_id(mock_db):
+    """Test that passing creator_id inserts directly."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchone.return_value = (456,)
+
+    insert_game(_make_game("direct-game"), creator_id=9)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "FROM creators" not in query
+    assert params[2] == 9
+
+
 def test_insert_game_missing_creator(mock_env):
     """Test inserting a game with missing creator returns None."""
     with patch("src.db.psycopg2.connect") as mock_connect:
@@ -111,7 +357,7 @@ def test_insert_game_missing_creator(mock_env):
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        # Creator lookup returns None
+        # No creator row means nothing is inserted
         mock_cursor.fetchone.return_value = None
 
         game = Game(
@@ -132,264 +378,524 @@ def test_insert_game_missing_creator(mock_env):
         result = insert_game(game)
 
         assert result is None
-        assert mock_cursor.execute.call_count == 1  # creator lookup only
-def test_get_creator_by_name(mock_env):
-    """Test fetching a creator by name."""
+        mock_cursor.execute.assert_called_once()
+def _make_game(itch_id: str, title: str = "Test Game") -> Game:
+    return Game(
+        id=None,
+        itch_id=itch_id,
+        title=title,
+        creator_name="testdev",
+        url=f"https://testdev.itch.io/{itch_id}",
+        publish_date=date(2024, 1, 1),
+        rating=None,
+        rating_count=0,
+        comment_count=0,
+        description=None,
+        tags=None,
+        scraped_at=None
+    )
+
+
+def test_insert_games_bulk(mock_env):
+    """Test inserting a batch of games as unnested column arrays."""
     with patch("src.db.psycopg2.connect") as mock_connect:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [(10,), (11,)]
 
-        mock_cursor.fetchone.return_value = {
-            "id": 1,
-            "name": "testdev",
-            "profile_url": "https://testdev.itch.io",
-            "backfilled": False,
-            "first_seen": datetime(2024, 1, 1)
-        }
+        result = insert_games_bulk([_make_game("game-a"), _make_game("game-b")], creator_id=7)
 
-        result = get_creator_by_name("testdev")
+        assert result == [10, 11]
+        mock_cursor.execute.assert_called_once()
+        query, params = mock_cursor.execute.call_args[0]
+        assert "unnest(" in query
+        assert params[0] == 7  # creator_id
+        assert params[1] == ["game-a", "game-b"]  # itch_ids
+        assert params[3] == ["https://testdev.itch.io/game-a", "https://testdev.itch.io/game-b"]
+        mock_conn.commit.assert_called_once()
 
-        assert result is not None
-        assert result.name == "testdev"
-        assert result.id == 1
-        assert result.backfilled is False
 
+def test_insert_games_bulk_marks_creator_backfilled(mock_db):
+    """Test that mark_backfilled folds the creator update into the insert."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = [(10,)]
 
-def test_get_creator_by_name_not_found(mock_env):
-    """Test fetching a non-existent creator."""
+    insert_games_bulk([_make_game("game-a")], creator_id=7, mark_backfilled=True)
+
+    mock_cursor.execute.assert_called_once()
+    query, params = mock_cursor.execute.call_args[0]
+    assert "UPDATE creators SET backfilled = TRUE" in query
+    assert params[:3] == (7, 7, ["game-a"])
+
+
+def test_insert_games_bulk_collapses_duplicates(mock_db):
+    """Test that duplicate itch_ids are sent only once per batch."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = [(10,)]
+
+    insert_games_bulk([_make_game("game-a"), _make_game("game-a", "Renamed")], creator_id=7)
+
+    params = mock_cursor.execute.call_args[0][1]
+    assert params[1] == ["game-a"]
+    assert params[2] == ["Renamed"]
+
+
+def test_insert_games_bulk_uses_copy_for_large_batches(mock_db, monkeypatch):
+    """Test that large batches are streamed through COPY into a staging table."""
+    import src.db
+    monkeypatch.setattr(src.db, "_COPY_THRESHOLD", 2)
+
+    copied = []
+
+    _, mock_cursor = mock_db
+    mock_cursor.copy_expert.side_effect = lambda sql, buf: copied.append(buf.getvalue())
+    mock_cursor.fetchall.return_value = [(10,), (11,)]
+
+    games = [_make_game("game-a", 'Say "hi"'), _make_game("game-b", "")]
+    result = insert_games_bulk(games, creator_id=7)
+
+    assert result == [10, 11]
+    mock_cursor.copy_expert.assert_called_once()
+    lines = copied[0].splitlines()
+    # Strings are quoted (so empty titles aren't NULL), missing values are bare
+    assert lines[0] == '"game-a","Say ""hi""","https://testdev.itch.io/game-a",2024-01-01,,0,'
+    assert lines[1].startswith('"game-b","",')
+
+    queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert "CREATE TEMP TABLE games_stage" in queries[0]
+    assert "FROM games_stage" in queries[1]
+    assert mock_cursor.execute.call_args_list[1][0][1] == (7,)
+    assert queries[2] == "DROP TABLE games_stage"
+
+
+def test_insert_games_bulk_empty(mock_env):
+    """Test that an empty batch skips the database entirely."""
     with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None
+        assert insert_games_bulk([], creator_id=7) == []
+        mock_connect.assert_not_called()
 
-        result = get_creator_by_name("nonexistent")
 
-        assert result is None
+def test_insert_games_for_creators(mock_db):
+    """Test that games from several creators go out as one statement."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = [(10,), (11,)]
+
+    other = replace(_make_game("game-b"), creator_name="otherdev")
+    unknown = replace(_make_game("game-c"), creator_name="nobody")
+    games = [_make_game("game-a"), _make_game("game-a", "Renamed"), other, unknown]
+
+    result = insert_games_for_creators(games, {"testdev": 7, "otherdev": 8})
+
+    assert result == [10, 11]
+    mock_cursor.execute.assert_called_once()
+    params = mock_cursor.execute.call_args[0][1]
+    assert params[0] == [7, 8]  # creator_ids
+    assert params[1] == ["game-a", "game-b"]  # duplicates collapsed, unknown creator skipped
+    assert params[2] == ["Renamed", "Test Game"]
+
+
+def test_get_creator_by_name(mock_db):
+    """Test fetching a creator by name."""
+    _, mock_cursor = mock_db
+
+    mock_cursor.fetchone.return_value = (
+        1, "testdev", "https://testdev.itch.io", False, datetime(2024, 1, 1)
+    )
+
+    result = get_creator_by_name("testdev")
+
+    assert result is not None
+    assert result.name == "testdev"
+    assert result.id == 1
+    assert result.backfilled is False
 
 
-def test_get_unbackfilled_creators(mock_env):
+def test_get_creator_by_name_not_found(mock_db):
+    """Test fetching a non-existent creator."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchone.return_value = None
+
+    result = get_creator_by_name("nonexistent")
+
+    assert result is None
+
+
+def test_get_unbackfilled_creators(mock_db):
     """Test fetching unbackfilled creators."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+    _, mock_cursor = mock_db
 
-        mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "name": "dev1",
-                "profile_url": "https://dev1.itch.io",
-                "backfilled": False,
-                "first_seen": datetime(2024, 1, 1)
-            },
-            {
-                "id": 2,
-                "name": "dev2",
-                "profile_url": "https://dev2.itch.io",
-                "backfilled": False,
-                "first_seen": datetime(2024, 1, 2)
-            }
-        ]
+    mock_cursor.fetchall.return_value = [
+        (1, "dev1", "https://dev1.itch.io", False, datetime(2024, 1, 1)),
+        (2, "dev2", "https://dev2.itch.io", False, datetime(2024, 1, 2)),
+    ]
 
-        result = get_unbackfilled_creators()
+    result = list(get_unbackfilled_creators())
 
-        assert len(result) == 2
-        assert result[0].name == "dev1"
-        assert result[1].name == "dev2"
+    assert len(result) == 2
+    assert result[0].name == "dev1"
+    assert result[1].name == "dev2"
 
 
-def test_get_unenriched_games(mock_env):
-    """Test fetching games without ratings."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+def test_get_unbackfilled_creators_streams_in_batches(mock_db, monkeypatch):
+    """Test that creators are paged by ID instead of fetched all at once."""
+    import src.db
+    monkeypatch.setattr(src.db, "_STREAM_BATCH_SIZE", 2)
 
-        mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "itch_id": "game-1",
-                "title": "Game 1",
-                "creator_name": "dev1",
-                "url": "https://dev1.itch.io/game-1",
-                "publish_date": date(2024, 1, 1),
-                "rating": None,
-                "rating_count": 0,
-                "comment_count": 0,
-                "description": None,
-                "tags": None,
-                "scraped_at": None
-            }
-        ]
+    def creator_row(creator_id):
+        return (creator_id, f"dev{creator_id}", f"https://dev{creator_id}.itch.io", False, datetime(2024, 1, 1))
 
-        result = get_unenriched_games()
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.side_effect = [
+        [creator_row(1), creator_row(5)],
+        [creator_row(9)],
+    ]
 
-        assert len(result) == 1
-        assert result[0].title == "Game 1"
-        assert result[0].scraped_at is None
+    result = list(get_unbackfilled_creators())
 
+    assert [creator.id for creator in result] == [1, 5, 9]
+    params = [call[0][1] for call in mock_cursor.execute.call_args_list]
+    assert params == [(0, 2), (5, 2)]  # (last_id, batch size)
 
-def test_get_unenriched_games_with_zero_rating(mock_env):
-    """Test that 0.0 rating is preserved and not coerced to None."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
 
-        mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "itch_id": "game-zero-rating",
-                "title": "Game with Zero Rating",
-                "creator_name": "dev1",
-                "url": "https://dev1.itch.io/game-zero-rating",
-                "publish_date": date(2024, 1, 1),
-                "rating": 0.0,  # Zero rating should be preserved
-                "rating_count": 10,
-                "comment_count": 0,
-                "description": None,
-                "tags": None,
-                "scraped_at": None
-            }
-        ]
+def test_get_unenriched_games(mock_db):
+    """Test fetching games without ratings."""
+    _, mock_cursor = mock_db
+
+    mock_cursor.fetchall.side_effect = [[
+        (
+            1,  # id
+            "game-1",  # itch_id
+            "Game 1",  # title
+            "dev1",  # creator_name
+            "https://dev1.itch.io/game-1",  # url
+            date(2024, 1, 1),  # publish_date
+            None,  # rating
+            0,  # rating_count
+            0,  # comment_count
+            None,  # description
+            None,  # tags
+            None,  # scraped_at
+        )
+    ], []]
 
-        result = get_unenriched_games()
+    result = list(get_unenriched_games())
 
-        assert len(result) == 1
-        assert result[0].rating == 0.0  # Should NOT be None
-        assert result[0].rating_count == 10
+    assert len(result) == 1
+    assert result[0].title == "Game 1"
+    assert result[0].scraped_at is None
 
 
-def test_get_unenriched_games_with_null_creator(mock_env):
-    """Test that games with NULL creator_id are included (LEFT JOIN)."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+def test_get_unenriched_games_with_zero_rating(mock_db):
+    """Test that 0.0 rating is preserved and not coerced to None."""
+    _, mock_cursor = mock_db
+
+    mock_cursor.fetchall.side_effect = [[
+        (
+            1,  # id
+            "game-zero-rating",  # itch_id
+            "Game with Zero Rating",  # title
+            "dev1",  # creator_name
+            "https://dev1.itch.io/game-zero-rating",  # url
+            date(2024, 1, 1),  # publish_date
+            0.0,  # Zero rating should be preserved
+            10,  # rating_count
+            0,  # comment_count
+            None,  # description
+            None,  # tags
+            None,  # scraped_at
+        )
+    ], []]
 
-        mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "itch_id": "orphaned-game",
-                "title": "Orphaned Game",
-                "creator_name": None,  # NULL creator_id
-                "url": "https://example.itch.io/orphaned-game",
-                "publish_date": date(2024, 1, 1),
-                "rating": None,
-                "rating_count": 0,
-                "comment_count": 0,
-                "description": None,
-                "tags": None,
-                "scraped_at": None
-            }
-        ]
+    result = list(get_unenriched_games())
 
-        result = get_unenriched_games()
+    assert len(result) == 1
+    assert result[0].rating == 0.0  # Should NOT be None
+    assert result[0].rating_count == 10
 
-        assert len(result) == 1
-        assert result[0].title == "Orphaned Game"
-        assert result[0].creator_name == "unknown"  # NULL mapped to "unknown"
+
+def test_get_unenriched_games_with_null_creator(mock_db):
+    """Test that games with NULL creator_id are included (LEFT JOIN)."""
+    _, mock_cursor = mock_db
+
+    mock_cursor.fetchall.side_effect = [[
+        (
+            1,  # id
+            "orphaned-game",  # itch_id
+            "Orphaned Game",  # title
+            None,  # NULL creator_id
+            "https://example.itch.io/orphaned-game",  # url
+            date(2024, 1, 1),  # publish_date
+            None,  # rating
+            0,  # rating_count
+            0,  # comment_count
+            None,  # description
+            None,  # tags
+            None,  # scraped_at
+        )
+    ], []]
+
+    result = list(get_unenriched_games())
+
+    assert len(result) == 1
+    assert result[0].title == "Orphaned Game"
+    assert result[0].creator_name == "unknown"  # NULL mapped to "unknown"
 
 
-def test_get_unenriched_games_includes_missing_metadata(mock_env):
+def test_get_unenriched_games_includes_missing_metadata(mock_db):
     """Test that query includes missing metadata criteria."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+    _, mock_cursor = mock_db
+
+    mock_cursor.fetchall.return_value = []
+
+    list(get_unenriched_games())
+
+    args = mock_cursor.execute.call_args[0]
+    query = args[0]
+    assert "g.rating::float8" in query
+    assert "g.description IS NULL" in query
+    assert "g.publish_date IS NULL" in query
+    assert "g.title IS NULL" in query
+
+
+def test_get_unenriched_games_queries_each_reason_separately(mock_db):
+    """Test that each enrichment reason is its own keyset branch."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = []
+
+    list(get_unenriched_games(limit=10, backfill_missing_metadata=False))
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert query.count("UNION") == 1
+    assert params == (0, 10, 0, 10, 10)  # (last_id, batch size) per branch, then overall batch size
+
+
+def test_get_unenriched_games_claims_batch(mock_db):
+    """Test that each batch is locked and claimed so parallel workers skip it."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.return_value = []
+
+    list(get_unenriched_games())
+
+    query = mock_cursor.execute.call_args[0][0]
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert "UPDATE games SET enrich_claimed_at = NOW()" in query
+    assert "scraped_at = NOW()" not in query
+    # Every reason for enrichment skips games another worker holds a claim on
+    assert query.count("g.enrich_claimed_at IS NULL") == 3
+
 
-        mock_cursor.fetchall.return_value = []
+def test_get_unenriched_games_continues_after_short_batch(mock_db, monkeypatch):
+    """Test that a batch shortened by SKIP LOCKED doesn't end the stream."""
+    import src.db
+    monkeypatch.setattr(src.db, "_STREAM_BATCH_SIZE", 2)
 
-        get_unenriched_games()
+    def game_row(game_id):
+        return (game_id, f"game-{game_id}", f"Game {game_id}", "dev1", f"https://dev1.itch.io/game-{game_id}",
+                None, None, 0, 0, None, None, None)
 
-        args = mock_cursor.execute.call_args[0]
-        query = args[0]
-        assert "g.description IS NULL" in query
-        assert "g.publish_date IS NULL" in query
-        assert "g.title IS NULL" in query
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.side_effect = [[game_row(1)], [game_row(7)], []]
 
+    result = list(get_unenriched_games(backfill_missing_metadata=False))
 
-def test_mark_game_failed_sets_cooldown(mock_env):
+    assert [game.id for game in result] == [1, 7]
+    params = [call[0][1] for call in mock_cursor.execute.call_args_list]
+    assert params == [(0, 2, 0, 2, 2), (1, 2, 1, 2, 2), (7, 2, 7, 2, 2)]
+
+
+def test_mark_game_failed_sets_cooldown(mock_db, prepared_statements):
     """Test marking a game as failed uses a cooldown interval."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+    _, mock_cursor = mock_db
+
+    from src.db import mark_game_failed
 
-        from src.db import mark_game_failed
+    mark_game_failed(42, cooldown_days=5)
 
-        mark_game_failed(42, cooldown_days=5)
+    prepare_args = mock_cursor.execute.call_args_list[0][0]
+    assert "make_interval" in prepare_args[0]
+    args = mock_cursor.execute.call_args[0]
+    assert args[0].startswith("EXECUTE mark_game_failed")
+    assert args[1] == (5, 42)
 
-        args = mock_cursor.execute.call_args[0]
-        assert "make_interval" in args[0]
-        assert args[1] == (5, 42)
 
+def test_mark_games_failed(mock_db):
+    """Test marking several failed games in one statement."""
+    _, mock_cursor = mock_db
 
-def test_update_game_ratings(mock_env):
+    from src.db import mark_games_failed
+
+    mark_games_failed([1, 2, 3])
+
+    mock_cursor.execute.assert_called_once()
+    query, params = mock_cursor.execute.call_args[0]
+    assert "id = ANY(%s)" in query
+    assert "enrich_claimed_at = NULL" in query
+    assert params == (7, [1, 2, 3])
+
+
+def test_update_game_ratings(mock_db, prepared_statements):
     """Test updating game ratings."""
+    _, mock_cursor = mock_db
+
+    update_game_ratings(1, 4.5, 100, comment_count=25, description="A cool game")
+
+    # PREPARE on first use, then EXECUTE
+    assert mock_cursor.execute.call_count == 2
+    args = mock_cursor.execute.call_args[0]
+    # SQL params order: rating, rating_count, comment_count, description, tags,
+    #                   publish_date, title, game_id (scraped_at is NOW() server-side)
+    assert args[1][0] == 4.5  # rating
+    assert args[1][1] == 100  # rating_count
+    assert args[1][2] == 25   # comment_count
+    assert args[1][3] == "A cool game"  # description
+    assert args[1][7] == 1    # game_id (last param)
+
+
+def test_update_game_ratings_prepares_once_per_connection(mock_env, prepared_statements):
+    """Test that repeated updates on a pooled connection reuse the prepared statement."""
     with patch("src.db.psycopg2.connect") as mock_connect:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        update_game_ratings(1, 4.5, 100, comment_count=25, description="A cool game")
+        with transaction():
+            update_game_ratings(1, 4.5, 100)
+            update_game_ratings(2, 3.0, 10)
 
-        mock_cursor.execute.assert_called_once()
-        args = mock_cursor.execute.call_args[0]
-        # SQL params order: rating, rating_count, comment_count, description, tags,
-        #                   publish_date, title, scraped_at, game_id
-        assert args[1][0] == 4.5  # rating
-        assert args[1][1] == 100  # rating_count
-        assert args[1][2] == 25   # comment_count
-        assert args[1][3] == "A cool game"  # description
-        assert args[1][8] == 1    # game_id (last param)
+        queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert len(queries) == 3
+        assert queries[0].startswith("PREPARE update_game_ratings AS")
+        assert queries[1].startswith("EXECUTE update_game_ratings")
+        assert queries[2].startswith("EXECUTE update_game_ratings")
+
+
+def test_update_game_ratings_without_prepared_statements(mock_db, monkeypatch):
+    """Test that prepared statements can be disabled for transaction-mode poolers."""
+    import src.db
+    monkeypatch.setattr(src.db, "_USE_PREPARED_STATEMENTS", False)
+
+    _, mock_cursor = mock_db
+
+    update_game_ratings(1, 4.5, 100)
+
+    mock_cursor.execute.assert_called_once()
+    query = mock_cursor.execute.call_args[0][0]
+    assert "$" not in query
+    assert query.count("%s") == 8
+
+
+def test_execute_prepared_without_prepared_statements_binds_by_index(mock_db, monkeypatch):
+    """Test that reused and reordered $n placeholders bind the right values."""
+    import src.db
+    monkeypatch.setattr(src.db, "_USE_PREPARED_STATEMENTS", False)
+
+    _, mock_cursor = mock_db
+
+    src.db._execute_prepared(
+        mock_cursor, "reordered",
+        "SELECT $2, $1 WHERE name LIKE 'a%' AND id = $1",
+        (10, "x")
+    )
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert query == "SELECT %s, %s WHERE name LIKE 'a%%' AND id = %s"
+    assert params == ("x", 10, 10)
+
+
+def test_update_game_ratings_bulk(mock_db):
+    """Test that many rating updates go out as one UPDATE ... FROM VALUES."""
+    with patch("src.db.execute_values") as mock_execute_values:
+        updates = [
+            GameRatingUpdate(1, 4.5, 100, 3, "Fun", datetime(2024, 1, 2, 10, 0), "Game 1", ["rpg"], False),
+            GameRatingUpdate(2, None, 0, 0, None, None, None, None, True),
+        ]
+
+        update_game_ratings_bulk(updates)
+
+        mock_execute_values.assert_called_once()
+        query = mock_execute_values.call_args[0][1]
+        rows = mock_execute_values.call_args[0][2]
+        assert "FROM (VALUES %s)" in query
+        assert rows[0] == (1, 4.5, 100, 3, "Fun", date(2024, 1, 2), "Game 1", ["rpg"], False)
+        assert rows[1][0] == 2
+        assert rows[1][-1] is True
+
+
+def test_update_game_ratings_bulk_hidden_leaves_scraped_at_null(mock_db):
+    """Test that a claimed game whose ratings are hidden still reads as never scraped."""
+    _, mock_cursor = mock_db
+    mock_cursor.fetchall.side_effect = [[], []]
+    list(get_unenriched_games())
+    claim_query = mock_cursor.execute.call_args[0][0]
+
+    with patch("src.db.execute_values") as mock_execute_values:
+        update_game_ratings_bulk([GameRatingUpdate(2, None, 0, 0, None, None, None, None, True)])
+
+        query = mock_execute_values.call_args[0][1]
+
+    # Claiming doesn't touch scraped_at, and hidden rows keep the existing
+    # (NULL) value while the claim is released
+    assert "SET scraped_at" not in claim_query
+    assert "scraped_at = CASE WHEN v.ratings_hidden THEN g.scraped_at ELSE NOW() END" in query
+    assert "enrich_claimed_at = NULL" in query
 
 
-def test_mark_creator_backfilled(mock_env):
+def test_update_game_ratings_bulk_empty(mock_db):
+    """Test that an empty batch sends nothing."""
+    _, mock_cursor = mock_db
+
+    with patch("src.db.execute_values") as mock_execute_values:
+        update_game_ratings_bulk([])
+
+        mock_execute_values.assert_not_called()
+        mock_cursor.execute.assert_not_called()
+
+
+def test_mark_creator_backfilled(mock_db):
     """Test marking a creator as backfilled."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+    _, mock_cursor = mock_db
 
-        mark_creator_backfilled(1)
+    mark_creator_backfilled(1)
 
-        mock_cursor.execute.assert_called_once()
-        assert "backfilled = TRUE" in mock_cursor.execute.call_args[0][0]
+    mock_cursor.execute.assert_called_once()
+    assert "backfilled = TRUE" in mock_cursor.execute.call_args[0][0]
 
 
-def test_upsert_creator_score(mock_env):
-    """Test upserting a creator score."""
-    with patch("src.db.psycopg2.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+def test_upsert_creator_scores_bulk(mock_db):
+    """Test that many scores are upserted with one execute_values call."""
+    with patch("src.db.execute_values") as mock_execute_values:
+        scores = [CreatorScore(1, 10, 500, 4.2, 4.15), CreatorScore(2, 1, 0, 3.5, 3.5)]
 
-        score = CreatorScore(
-            creator_id=1,
-            game_count=10,
-            total_ratings=500,
-            avg_rating=4.2,
-            bayesian_score=4.15
-        )
+        upsert_creator_scores_bulk(scores)
 
-        upsert_creator_score(score)
+        mock_execute_values.assert_called_once()
+        query, rows = mock_execute_values.call_args[0][1:3]
+        assert "ON CONFLICT (creator_id) DO UPDATE" in query
+        assert rows == [(1, 10, 500, 4.2, 4.15), (2, 1, 0, 3.5, 3.5)]
+        assert "NOW()" in mock_execute_values.call_args[1]["template"]
 
-        mock_cursor.execute.assert_called_once()
-        args = mock_cursor.execute.call_args[0]
-        assert args[1][0] == 1  # creator_id
-        assert args[1][1] == 10  # game_count
-        assert args[1][2] == 500  # total_ratings
+
+def test_upsert_creator_score(mock_db, prepared_statements):
+    """Test upserting a creator score."""
+    _, mock_cursor = mock_db
+
+    score = CreatorScore(
+        creator_id=1,
+        game_count=10,
+        total_ratings=500,
+        avg_rating=4.2,
+        bayesian_score=4.15
+    )
+
+    upsert_creator_score(score)
+
+    # PREPARE on first use, then EXECUTE
+    assert mock_cursor.execute.call_count == 2
+    args = mock_cursor.execute.call_args[0]
+    assert args[0].startswith("EXECUTE upsert_creator_score")
+    assert args[1][0] == 1  # creator_id
+    assert args[1][1] == 10  # game_count
+    assert args[1][2] == 500  # total_ratings
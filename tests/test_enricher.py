@@ -5,7 +5,7 @@ from unittest.mock import patch
 import pytest
 
 from src.enricher import enrich_all, enrich_game
-from src.models import Game
+from src.models import Game, GameRatingUpdate
 
 
 @pytest.fixture
@@ -53,7 +53,7 @@ def test_enrich_game(sample_game, sample_game_html):
         assert result is True
 
         # Should have fetched the game page
-        mock_fetch.assert_called_once_with("https://testdev.itch.io/cool-adventure")
+        mock_fetch.assert_called_once_with("https://testdev.itch.io/cool-adventure", force_refresh=False)
 
         # Should have updated ratings (not hidden since we have a rating)
         mock_update.assert_called_once()
@@ -120,18 +120,63 @@ def test_enrich_all_with_errors():
 
     with patch("src.enricher.db.get_unenriched_games") as mock_get_games, \
          patch("src.enricher.enrich_game") as mock_enrich_game, \
-         patch("src.enricher.db.mark_game_failed") as mock_mark_failed:
+         patch("src.enricher.db.update_game_ratings_bulk"), \
+         patch("src.enricher.db.mark_games_failed") as mock_mark_failed:
 
         mock_get_games.return_value = [game1, game2, game3]
         # First succeeds, second fails, third succeeds
-        mock_enrich_game.side_effect = [True, Exception("Network error"), True]
+        def fake_enrich(game, updates, force_refresh=False):
+            if game.id == 2:
+                raise Exception("Network error")
+            return True
+
+        mock_enrich_game.side_effect = fake_enrich
 
         result = enrich_all()
 
         assert result["games_processed"] == 2  # Only successful ones
         assert result["errors"] == 1
         # Failed game should be marked with cooldown
-        mock_mark_failed.assert_called_once_with(2)
+        mock_mark_failed.assert_called_once_with([2])
+
+
+def test_enrich_all_retries_failed_batch_one_game_at_a_time():
+    """Test that a failed batched update is retried per game and the run still finishes."""
+    games = [
+        Game(i, f"game{i}", f"Game {i}", "dev", f"https://dev.itch.io/game{i}",
+             date(2024, 1, 1), None, 0, 0, None, None, None)
+        for i in range(1, 5)
+    ]
+
+    def fake_enrich(game, updates, force_refresh=False):
+        if game.id == 4:
+            raise Exception("Network error")
+        updates.append(GameRatingUpdate(game.id, 4.0, 10, 0, None, None, game.title, None, False))
+        return True
+
+    def fake_update(game_id, *args, **kwargs):
+        if game_id == 2:
+            raise Exception("bad row")
+
+    with patch("src.enricher.db.get_unenriched_games") as mock_get_games, \
+         patch("src.enricher.enrich_game", side_effect=fake_enrich), \
+         patch("src.enricher.db.update_game_ratings_bulk") as mock_update_bulk, \
+         patch("src.enricher.db.update_game_ratings", side_effect=fake_update) as mock_update, \
+         patch("src.enricher.db.mark_games_failed") as mock_mark_failed:
+
+        mock_get_games.return_value = games
+        mock_update_bulk.side_effect = Exception("connection lost")
+
+        result = enrich_all()
+
+        assert result["games_processed"] == 3
+        assert result["errors"] == 1
+        assert sorted(call[0][0] for call in mock_update.call_args_list) == [1, 2, 3]
+        assert mock_update.call_args_list[0][1]["title"].startswith("Game ")
+
+        # The game whose fetch failed and the one whose row failed both get a cooldown
+        mock_mark_failed.assert_called_once()
+        assert sorted(mock_mark_failed.call_args[0][0]) == [2, 4]
 
 
 def test_enrich_all_no_games():
@@ -164,4 +209,36 @@ def test_enrich_game_calls_http_client(sample_game, sample_game_html):
         enrich_game(sample_game)
 
         # Verify fetch was called with the game URL
-        mock_fetch.assert_called_once_with(sample_game.url)
+        mock_fetch.assert_called_once_with(sample_game.url, force_refresh=False)
+
+
+def test_enrich_all_writes_updates_in_batches(sample_game_html, monkeypatch):
+    """Test that enrich_all buffers rating updates and flushes them in bulk."""
+    import src.enricher
+    monkeypatch.setattr(src.enricher, "_UPDATE_BATCH_SIZE", 2)
+
+    games = [
+        Game(i, f"game{i}", f"Game {i}", "dev", f"https://dev.itch.io/game{i}",
+             date(2024, 1, 1), None, 0, 0, None, None, None)
+        for i in range(1, 4)
+    ]
+
+    with patch("src.enricher.db.get_unenriched_games") as mock_get_games, \
+         patch("src.enricher.fetch") as mock_fetch, \
+         patch("src.enricher.db.update_game_ratings") as mock_update, \
+         patch("src.enricher.db.update_game_ratings_bulk") as mock_update_bulk:
+
+        mock_get_games.return_value = games
+        mock_fetch.return_value = sample_game_html
+
+        result = enrich_all()
+
+        assert result["games_processed"] == 3
+        mock_update.assert_not_called()
+
+        # One full batch, then the remainder at the end. Games run
+        # concurrently, so only the batch sizes are fixed, not their order.
+        batches = [call[0][0] for call in mock_update_bulk.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert sorted(update.game_id for batch in batches for update in batch) == [1, 2, 3]
+        assert batches[0][0].rating == 4.5
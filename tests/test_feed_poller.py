@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
@@ -85,6 +86,30 @@ def test_get_new_releases_deduplication(sample_feed_xml):
         assert len(urls) == len(set(urls))  # No duplicates
 
 
+def test_get_new_releases_merges_in_feed_order():
+    """Test that duplicates keep the entry from the earliest feed, whichever finishes first."""
+    feeds = ["https://itch.io/first.xml", "https://itch.io/second.xml"]
+    first_started = threading.Event()
+    second_done = threading.Event()
+
+    def fake_poll(feed_url):
+        if feed_url == feeds[0]:
+            # Finish after the second feed so thread timing can't decide the winner
+            first_started.set()
+            second_done.wait(timeout=5)
+        else:
+            first_started.wait(timeout=5)
+            second_done.set()
+        return [{"title": feed_url, "creator": "dev", "game_url": "https://dev.itch.io/game", "publish_date": None}]
+
+    with patch("src.feed_poller._default_feeds", feeds), \
+         patch("src.feed_poller.poll_feed", side_effect=fake_poll):
+
+        result = get_new_releases()
+
+        assert [entry["title"] for entry in result] == [feeds[0]]
+
+
 def test_extract_creator_from_url():
     """Test extracting creator name from various URL formats."""
     # Standard format
@@ -102,6 +127,9 @@ def test_extract_creator_from_url():
     assert _extract_creator_from_url("https://www.itch.io/game") is None
     assert _extract_creator_from_url("https://itch.io/games") is None
 
+    # Domains that only end in itch.io-like text aren't creator URLs
+    assert _extract_creator_from_url("https://testdev.itch.io.example.com/game") is None
+
 
 def test_poll_feed_no_publish_date():
     """Test parsing feed entries without publish dates."""
@@ -167,3 +195,49 @@ def test_poll_feed_handles_malformed_entries():
         assert len(result) == 1
         assert result[0]["title"] == "Good Game"
         assert result[0]["game_url"] == "https://testdev.itch.io/good-game"
+
+
+def test_poll_feed_ignores_declared_encoding():
+    """Test that already-decoded text isn't re-decoded with the declared encoding."""
+    feed_latin1 = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<rss version="2.0">
+  <channel>
+    <item>
+      <title>Café Ñandú</title>
+      <link>https://testdev.itch.io/cafe</link>
+    </item>
+  </channel>
+</rss>"""
+
+    with patch("src.feed_poller.fetch") as mock_fetch:
+        mock_fetch.return_value = feed_latin1
+
+        result = poll_feed("https://itch.io/games.xml")
+
+        assert len(result) == 1
+        assert result[0]["title"] == "Café Ñandú"
+
+
+def test_poll_feed_keeps_entries_with_empty_title():
+    """Test that an item with an empty title is kept, as long as it has a link."""
+    feed_empty_title = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <item>
+      <title></title>
+      <link>https://testdev.itch.io/untitled</link>
+    </item>
+    <item>
+      <link>https://testdev.itch.io/no-title-element</link>
+    </item>
+  </channel>
+</rss>"""
+
+    with patch("src.feed_poller.fetch") as mock_fetch:
+        mock_fetch.return_value = feed_empty_title
+
+        result = poll_feed("https://itch.io/games.xml")
+
+        assert len(result) == 1
+        assert result[0]["title"] == ""
+        assert result[0]["game_url"] == "https://testdev.itch.io/untitled"
@@ -8,16 +8,17 @@ from src.http_client import fetch
 
 
 @pytest.fixture(autouse=True)
-def reset_rate_limit():
-    """Reset rate limiting state before each test."""
+def reset_rate_limit(monkeypatch):
+    """Reset rate limiting state and disable the page cache before each test."""
     import src.http_client
     src.http_client._last_request_time = None
+    monkeypatch.delenv("HTTP_CACHE_DIR", raising=False)
     yield
 
 
 def test_fetch_success():
     """Test successful fetch."""
-    with patch("src.http_client.httpx.get") as mock_get:
+    with patch("src.http_client._client.get") as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html>test</html>"
@@ -32,7 +33,7 @@ def test_fetch_success():
 
 def test_fetch_rate_limiting():
     """Test that rate limiting enforces minimum delay."""
-    with patch("src.http_client.httpx.get") as mock_get:
+    with patch("src.http_client._client.get") as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html>test</html>"
@@ -55,7 +56,7 @@ def test_fetch_rate_limiting():
 
 def test_fetch_429_retry():
     """Test retry logic on rate limiting (429)."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep") as mock_sleep, \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -79,7 +80,7 @@ def test_fetch_429_retry():
 
 def test_fetch_500_retry():
     """Test retry logic on server error (500)."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep") as mock_sleep, \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -102,7 +103,7 @@ def test_fetch_500_retry():
 
 def test_fetch_max_retries_exceeded():
     """Test that fetch fails after max retries."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep"), \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -120,7 +121,7 @@ def test_fetch_max_retries_exceeded():
 
 def test_fetch_timeout_retry():
     """Test retry on timeout."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep"), \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -139,7 +140,7 @@ def test_fetch_timeout_retry():
 
 def test_fetch_non_retryable_error():
     """Test that non-retryable errors (404, etc.) don't retry."""
-    with patch("src.http_client.httpx.get") as mock_get:
+    with patch("src.http_client._client.get") as mock_get:
 
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -157,7 +158,7 @@ def test_fetch_non_retryable_error():
 
 def test_exponential_backoff():
     """Test that exponential backoff increases correctly."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep") as mock_sleep, \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -179,7 +180,7 @@ def test_exponential_backoff():
 
 def test_retry_after_respected():
     """Test that Retry-After header increases backoff."""
-    with patch("src.http_client.httpx.get") as mock_get, \
+    with patch("src.http_client._client.get") as mock_get, \
          patch("src.http_client.time.sleep") as mock_sleep, \
          patch("src.http_client.random.uniform", return_value=0.0):
 
@@ -197,3 +198,154 @@ def test_retry_after_respected():
 
         assert result == "<html>success</html>"
         assert mock_sleep.call_args_list[0][0][0] >= 10
+
+
+def test_retry_after_shorter_than_backoff_is_used():
+    """Test that a short Retry-After replaces the exponential backoff."""
+    from src.http_client import _get_backoff_time
+
+    response = MagicMock()
+    response.headers = {"Retry-After": "1"}
+
+    with patch("src.http_client.random.uniform", return_value=0.0):
+        assert _get_backoff_time(response, attempt=2) == 1.0
+        # Long waits are capped
+        response.headers = {"Retry-After": "3600"}
+        assert _get_backoff_time(response, attempt=0) == 60.0
+
+
+def test_rate_limit_reserves_slots_for_concurrent_callers():
+    """Test that callers arriving together are spaced one delay apart."""
+    from src.http_client import _wait_for_request_slot
+
+    with patch("src.http_client.time.monotonic", return_value=100.0), \
+         patch("src.http_client.time.sleep") as mock_sleep:
+
+        _wait_for_request_slot()
+        _wait_for_request_slot()
+        _wait_for_request_slot()
+
+        # First caller goes immediately, the next two wait for later slots
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
+
+
+def test_fetch_revalidates_cached_page(tmp_path, monkeypatch):
+    """Test that a cached page is revalidated and reused on 304."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path))
+
+    with patch("src.http_client._client.get") as mock_get, \
+         patch("src.http_client.time.sleep"):
+
+        mock_response_200 = MagicMock()
+        mock_response_200.status_code = 200
+        mock_response_200.text = "<html>cached</html>"
+        mock_response_200.headers = {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+        mock_response_304 = MagicMock()
+        mock_response_304.status_code = 304
+        mock_response_304.headers = {}
+
+        mock_get.side_effect = [mock_response_200, mock_response_304]
+
+        assert fetch("https://example.com") == "<html>cached</html>"
+        assert "If-None-Match" not in mock_get.call_args_list[0][1]["headers"]
+
+        assert fetch("https://example.com") == "<html>cached</html>"
+        headers = mock_get.call_args_list[1][1]["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_fetch_refreshes_cache_entry_on_304(tmp_path, monkeypatch):
+    """Test that a 304 renews the cached expiry and validators so the next fetch skips the request."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path))
+
+    with patch("src.http_client._client.get") as mock_get, \
+         patch("src.http_client.time.sleep"):
+
+        mock_response_200 = MagicMock()
+        mock_response_200.status_code = 200
+        mock_response_200.text = "<html>cached</html>"
+        mock_response_200.headers = {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+        mock_response_304 = MagicMock()
+        mock_response_304.status_code = 304
+        mock_response_304.headers = {"ETag": '"def"', "Cache-Control": "max-age=300"}
+
+        mock_get.side_effect = [mock_response_200, mock_response_304]
+
+        fetch("https://example.com")
+        assert fetch("https://example.com") == "<html>cached</html>"
+        # Fresh again after the 304, so no third request
+        assert fetch("https://example.com") == "<html>cached</html>"
+        assert mock_get.call_count == 2
+
+        # New ETag stored, and the Last-Modified the 304 didn't resend is kept
+        with patch("src.http_client._client.get") as mock_get_again:
+            mock_get_again.return_value = mock_response_304
+            fetch("https://example.com", force_refresh=True)
+            headers = mock_get_again.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"def"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_fetch_reuses_fresh_cached_page_without_request(tmp_path, monkeypatch):
+    """Test that a page within its Cache-Control max-age is served from the cache."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path))
+
+    with patch("src.http_client._client.get") as mock_get, \
+         patch("src.http_client.time.sleep"):
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>fresh</html>"
+        mock_response.headers = {"Cache-Control": "public, max-age=300"}
+        mock_get.return_value = mock_response
+
+        assert fetch("https://example.com") == "<html>fresh</html>"
+        assert fetch("https://example.com") == "<html>fresh</html>"
+
+        mock_get.assert_called_once()
+
+
+def test_fetch_does_not_cache_no_store_pages(tmp_path, monkeypatch):
+    """Test that no-store responses are never written to the cache."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path))
+
+    with patch("src.http_client._client.get") as mock_get, \
+         patch("src.http_client.time.sleep"):
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>private</html>"
+        mock_response.headers = {"Cache-Control": "no-store, max-age=300", "ETag": '"abc"'}
+        mock_get.return_value = mock_response
+
+        fetch("https://example.com")
+
+        assert list(tmp_path.iterdir()) == []
+
+
+def test_fetch_force_refresh_revalidates_fresh_page(tmp_path, monkeypatch):
+    """Test that force_refresh skips the max-age shortcut but still revalidates."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path))
+
+    with patch("src.http_client._client.get") as mock_get, \
+         patch("src.http_client.time.sleep"):
+
+        mock_response_200 = MagicMock()
+        mock_response_200.status_code = 200
+        mock_response_200.text = "<html>fresh</html>"
+        mock_response_200.headers = {"Cache-Control": "max-age=300", "ETag": '"abc"'}
+
+        mock_response_304 = MagicMock()
+        mock_response_304.status_code = 304
+        mock_response_304.headers = {}
+
+        mock_get.side_effect = [mock_response_200, mock_response_304]
+
+        fetch("https://example.com")
+        assert fetch("https://example.com", force_refresh=True) == "<html>fresh</html>"
+
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[1][1]["headers"]["If-None-Match"] == '"abc"'
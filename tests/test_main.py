@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.main import _extract_profile_url, _store_discovered_games
+from src.models import Game
+
+
+@pytest.fixture(autouse=True)
+def mock_transaction():
+    """Stub out the database transaction wrapping discovery writes."""
+    with patch("src.main.db.transaction") as mock_txn:
+        yield mock_txn
+
+
+def _game(creator_name: str, slug: str) -> Game:
+    return Game(
+        id=None,
+        itch_id=slug,
+        title=slug.replace("-", " ").title(),
+        creator_name=creator_name,
+        url=f"https://{creator_name}.itch.io/{slug}",
+        publish_date=None,
+        rating=None,
+        rating_count=0,
+        comment_count=0,
+        description=None,
+        tags=None,
+        scraped_at=None
+    )
+
+
+def test_store_discovered_games_new_creators(mock_transaction):
+    """Test that unknown creators are inserted before their games."""
+    games = [_game("newdev", "game-a"), _game("newdev", "game-b"), _game("otherdev", "game-c")]
+
+    with patch("src.main.db.get_creator_ids") as mock_get_ids, \
+         patch("src.main.db.insert_creators_bulk") as mock_insert_creators, \
+         patch("src.main.db.insert_games_for_creators") as mock_insert_games:
+
+        mock_get_ids.return_value = {}
+        mock_insert_creators.return_value = {"newdev": 1, "otherdev": 2}
+        mock_insert_games.return_value = [10, 11, 12]
+
+        result = _store_discovered_games(games)
+
+        assert result == (2, 3)
+        mock_get_ids.assert_called_once_with(["newdev", "otherdev"])
+
+        creators = mock_insert_creators.call_args[0][0]
+        assert [creator.name for creator in creators] == ["newdev", "otherdev"]
+        assert creators[0].profile_url == "https://newdev.itch.io"
+        assert creators[0].backfilled is False
+
+        mock_insert_games.assert_called_once_with(games, {"newdev": 1, "otherdev": 2})
+        mock_transaction.assert_called_once()
+
+
+def test_store_discovered_games_existing_creators():
+    """Test that known creators are not inserted again."""
+    games = [_game("knowndev", "game-a"), _game("newdev", "game-b")]
+
+    with patch("src.main.db.get_creator_ids") as mock_get_ids, \
+         patch("src.main.db.insert_creators_bulk") as mock_insert_creators, \
+         patch("src.main.db.insert_games_for_creators") as mock_insert_games:
+
+        mock_get_ids.return_value = {"knowndev": 5}
+        mock_insert_creators.return_value = {"newdev": 6}
+        mock_insert_games.return_value = [20, 21]
+
+        result = _store_discovered_games(games)
+
+        assert result == (1, 2)
+        creators = mock_insert_creators.call_args[0][0]
+        assert [creator.name for creator in creators] == ["newdev"]
+        mock_insert_games.assert_called_once_with(games, {"knowndev": 5, "newdev": 6})
+
+
+def test_store_discovered_games_all_creators_known():
+    """Test that creator inserts are skipped when every creator exists."""
+    games = [_game("knowndev", "game-a")]
+
+    with patch("src.main.db.get_creator_ids") as mock_get_ids, \
+         patch("src.main.db.insert_creators_bulk") as mock_insert_creators, \
+         patch("src.main.db.insert_games_for_creators") as mock_insert_games:
+
+        mock_get_ids.return_value = {"knowndev": 5}
+        mock_insert_games.return_value = [20]
+
+        assert _store_discovered_games(games) == (0, 1)
+        mock_insert_creators.assert_not_called()
+
+
+def test_store_discovered_games_empty(mock_transaction):
+    """Test that no input makes no database calls."""
+    with patch("src.main.db.get_creator_ids") as mock_get_ids, \
+         patch("src.main.db.insert_games_for_creators") as mock_insert_games:
+
+        assert _store_discovered_games([]) == (0, 0)
+
+        mock_transaction.assert_not_called()
+        mock_get_ids.assert_not_called()
+        mock_insert_games.assert_not_called()
+
+
+def test_extract_profile_url():
+    """Test extracting the profile URL from game URLs."""
+    assert _extract_profile_url("https://testdev.itch.io/cool-game") == "https://testdev.itch.io"
+    assert _extract_profile_url("http://testdev.itch.io/cool-game") == "http://testdev.itch.io"
+    assert _extract_profile_url("testdev.itch.io/cool-game") == "https://testdev.itch.io"
+    assert _extract_profile_url("https://testdev.itch.io") == "https://testdev.itch.io"
+    assert _extract_profile_url("https://testdev.itch.io?ref=feed") == "https://testdev.itch.io"
+    assert _extract_profile_url("https://testdev.itch.io/game?ref=feed#top") == "https://testdev.itch.io"
+    assert _extract_profile_url("https://testdev.itch.io:8443/game") == "https://testdev.itch.io:8443"
+
+
+@pytest.mark.parametrize("game_url", ["", "https://", "https:///cool-game", "://cool-game", "/cool-game", "?page=2"])
+def test_extract_profile_url_rejects_missing_host(game_url):
+    """Test that URLs without a host are rejected instead of producing a bare scheme."""
+    with pytest.raises(ValueError):
+        _extract_profile_url(game_url)
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -116,37 +117,45 @@ def test_score_creator_few_ratings():
         assert result.bayesian_score > 0
 
 
+def assert_in_transaction(conn):
+    import src.db
+    assert src.db._active_conn.get() is conn
+
+
 def test_score_all():
-    """Test scoring all creators."""
+    """Test scoring all creators from one aggregate query and one bulk upsert."""
     with patch("src.scorer.db.get_connection") as mock_get_conn, \
-         patch("src.scorer.score_creator") as mock_score_creator, \
-         patch("src.scorer.db.upsert_creator_score") as mock_upsert:
+         patch("src.scorer.db.upsert_creator_scores_bulk") as mock_upsert:
 
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_get_conn.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
-        # Mock 3 creators
-        mock_cursor.fetchall.return_value = [(1,), (2,), (3,)]
-
-        # Mock score_creator to return dummy scores
-        from src.models import CreatorScore
-        mock_score_creator.side_effect = [
-            CreatorScore(1, 10, 100, 4.0, 5.95),
-            CreatorScore(2, 5, 50, 4.5, 5.25),
-            CreatorScore(3, 15, 200, 3.8, 6.78),
+        # (creator_id, total_games, total_ratings, weighted_rating_sum)
+        mock_cursor.fetchall.return_value = [
+            (1, 10, 100, Decimal("400.00")),
+            (2, 5, 0, Decimal("0")),
+            (3, 0, 0, 0),  # no games
         ]
 
+        # The upsert must share the aggregate query's transaction
+        mock_upsert.side_effect = lambda scores: assert_in_transaction(mock_conn)
+
         result = score_all()
 
         assert result["creators_scored"] == 3
-
-        # Should have called score_creator 3 times
-        assert mock_score_creator.call_count == 3
-
-        # Should have called upsert 3 times
-        assert mock_upsert.call_count == 3
+        mock_cursor.execute.assert_called_once()
+        assert "GROUP BY c.id" in mock_cursor.execute.call_args[0][0]
+
+        mock_upsert.assert_called_once()
+        scores = mock_upsert.call_args[0][0]
+        assert [score.creator_id for score in scores] == [1, 2, 3]
+        assert scores[0].avg_rating == 4.0
+        assert scores[0].bayesian_score == calculate_love_score(4.0, 100, 10)
+        assert scores[1].avg_rating == 3.5  # no ratings -> global average
+        assert scores[2].game_count == 0
+        assert scores[2].bayesian_score == 0.0
 
 
 def test_score_all_no_creators():